@@ -1,8 +1,54 @@
 import subprocess as s
-import os, sys
+import os, sys, json
+
+# Startup budget for short-lived jobs that only import what they need, against the fastest of a few runs so that
+# a cold disk cache or a busy machine doesn't fail the check
+IMPORT_BUDGET_SECONDS = 0.5
+IMPORT_BENCHMARK_RUNS = 5
+IMPORT_BENCHMARK = """
+import sys, time
+start = time.perf_counter()
+import submarine
+from submarine import BingoSolver
+elapsed = time.perf_counter() - start
+heavy = [module for module in ("pandas", "matplotlib") if module in sys.modules]
+print(f"{elapsed:.3f}", ",".join(heavy))
+"""
+
+
+def check_import_budget():
+    timings = []
+    for _ in range(IMPORT_BENCHMARK_RUNS):
+        output = s.check_output([sys.executable, "-c", IMPORT_BENCHMARK], text=True)
+        elapsed, heavy = output.strip("\n").split(" ")
+        if heavy:
+            raise RuntimeError(f"Importing BingoSolver also imported {heavy}")
+        timings.append(float(elapsed))
+    elapsed = min(timings)
+    print(
+        f"Importing submarine and BingoSolver took {elapsed:.3f}s at best over {len(timings)} runs"
+    )
+    if elapsed > IMPORT_BUDGET_SECONDS:
+        raise RuntimeError(
+            f"Importing submarine took {elapsed:.3f}s, over the {IMPORT_BUDGET_SECONDS}s budget"
+        )
+
+
+def check_batch_runner():
+    output = s.check_output(
+        [sys.executable, "-m", "submarine", "Radar", "data/day_01_*.csv"]
+        + ["--workers", "2", "--ordered"],
+        text=True,
+    )
+    results = [json.loads(line) for line in output.splitlines()]
+    print(f"The batch runner processed {len(results)} input files")
+    if not results or any("result" not in result for result in results):
+        raise RuntimeError(f"The batch runner failed: {results}")
 
 
 def main():
+    check_import_budget()
+    check_batch_runner()
     nbs = sorted(os.listdir("solutions/"))
     nbs = [nb for nb in nbs if not "nbconvert" in nb]
     for nb in nbs:
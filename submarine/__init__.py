@@ -1,8 +1,37 @@
-from submarine.systems import (
-    Radar,
-    Navigation,
-    PowerConsumption,
-    LifeSupport,
-)
-
-from submarine.entertainment import BingoSolver
+import importlib
+
+# The subsystems are only imported when first used, so jobs that only play bingo
+# don't pay for importing pandas
+_subsystems = {
+    "Radar": "submarine.systems",
+    "OnlineRadar": "submarine.systems",
+    "Navigation": "submarine.systems",
+    "OnlineNavigation": "submarine.systems",
+    "Diagnostics": "submarine.systems",
+    "PowerConsumption": "submarine.systems",
+    "LifeSupport": "submarine.systems",
+    "HydrothermalVents": "submarine.vents",
+    "LanternfishSchool": "submarine.population",
+    "CrabAlignment": "submarine.alignment",
+    "OctopusCavern": "submarine.octopuses",
+    "FrameFile": "submarine.frames",
+    "FramePipe": "submarine.frames",
+    "BingoSolver": "submarine.entertainment",
+    "BingoSimulator": "submarine.entertainment",
+    "InputCache": "submarine.inputs",
+    "TelemetryStore": "submarine.memory",
+}
+
+__all__ = list(_subsystems)
+
+
+def __getattr__(name: str):
+    if name in _subsystems:
+        subsystem = getattr(importlib.import_module(_subsystems[name]), name)
+        globals()[name] = subsystem
+        return subsystem
+    raise AttributeError(f"module 'submarine' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
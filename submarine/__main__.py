@@ -0,0 +1,5 @@
+import sys
+
+from submarine.cli import main
+
+sys.exit(main())
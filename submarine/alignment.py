@@ -0,0 +1,114 @@
+from typing import Callable, Tuple, Union
+
+import numpy as np
+
+from submarine.inputs import ReadCrabs
+
+
+def _square_sum(values: np.ndarray) -> int:
+    """The exact sum of squares of non-negative integers, however large.
+
+    The values are split into 16 bit limbs so the dot products between limbs can't overflow int64.
+    """
+    limbs = [(values >> (16 * i)) & 0xFFFF for i in range(4)]
+    total = 0
+    for i, a in enumerate(limbs):
+        for j, b in enumerate(limbs):
+            total += int(np.dot(a, b)) << (16 * (i + j))
+    return total
+
+
+class CrabAlignment(ReadCrabs):
+    """Find the horizontal position where the crab submarines can align spending the least fuel."""
+
+    def __init__(
+        self,
+        input: str,
+        cost: Union[str, Callable[[np.ndarray], np.ndarray]] = "linear",
+    ) -> None:
+        """Sort the crabs once and prepare the prefix sums to price any alignment position in O(log n).
+
+        Args:
+            input (str): The path to the file with the positions of the crabs
+            cost (Union[str, Callable], optional): The fuel a crab spends to move a distance. `"linear"` costs 1 per
+                step, `"triangular"` costs 1 for the first step, 2 for the second and so on. Any other convex cost
+                can be given as a function mapping an array of distances to an array of fuel costs, which is then
+                searched for its optimum over the range of positions. Defaults to "linear".
+        """
+        ReadCrabs.__init__(self, input=input)
+        if isinstance(cost, str) and cost not in ("linear", "triangular"):
+            raise ValueError(
+                f"Unknown cost {cost}, expected 'linear', 'triangular' or a function"
+            )
+        self.cost = cost
+
+        # shift the positions so the sums stay small, and use exact Python integers when int64 may overflow
+        self._origin = int(self.positions.min()) if self.positions.shape[0] else 0
+        self._sorted = np.sort(self.positions) - self._origin
+        span = int(self._sorted[-1]) if self._sorted.shape[0] else 0
+        dtype = np.int64 if (span + 1) * self._sorted.shape[0] < 2**62 else object
+        self._sums = np.concatenate(([0], np.cumsum(self._sorted.astype(dtype))))
+        self._square_sum = _square_sum(self._sorted)
+
+    def fuel(self, position: int) -> int:
+        """The total fuel the crabs spend to align at a position.
+
+        Args:
+            position (int): The horizontal position to align at
+
+        Returns:
+            int: The total fuel cost
+        """
+        p = int(position) - self._origin
+        if callable(self.cost):
+            return self.cost(np.abs(self._sorted - p)).sum()
+
+        n = self._sorted.shape[0]
+        left = int(np.searchsorted(self._sorted, p))
+        # total distance of the crabs left and right of the position
+        left_distance = left * p - int(self._sums[left])
+        right_distance = int(self._sums[n] - self._sums[left]) - (n - left) * p
+        if self.cost == "linear":
+            return left_distance + right_distance
+
+        # sum of the squared distances, expanded around the sums of positions and their squares
+        squares = n * p * p - 2 * p * int(self._sums[n]) + self._square_sum
+        return (squares + left_distance + right_distance) // 2
+
+    def _convex_search(self, low: int, high: int) -> int:
+        """Binary search the slope of a convex fuel cost for its leftmost optimum within `[low, high]`."""
+        while low < high:
+            mid = (low + high) // 2
+            if self.fuel(mid + 1) < self.fuel(mid):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def align(self) -> Tuple[int, int]:
+        """Find the cheapest position to align at, the leftmost one in case of ties.
+
+        Returns:
+            Tuple[int]: The optimal position and its total fuel cost
+        """
+        if self._sorted.shape[0] == 0:
+            raise ValueError("There are no crabs to align")
+        low = self._origin
+        high = self._origin + int(self._sorted[-1])
+
+        if self.cost == "linear":
+            candidates = [
+                self._origin + int(self._sorted[(self._sorted.shape[0] - 1) // 2])
+            ]
+        elif self.cost == "triangular":
+            # the optimum lies within half a step of the mean
+            mean = self._origin + int(self._sums[-1]) / self._sorted.shape[0]
+            candidates = range(
+                max(low, int(np.floor(mean - 0.5))),
+                min(high, int(np.ceil(mean + 0.5))) + 1,
+            )
+        else:
+            candidates = [self._convex_search(low, high)]
+
+        fuel, position = min((self.fuel(p), p) for p in candidates)
+        return position, fuel
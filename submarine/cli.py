@@ -0,0 +1,212 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+import submarine
+
+
+def _radar(input: str, options: dict) -> dict:
+    radar = submarine.Radar(input=input, column_names=["signal"])
+    return {
+        "step_directions": radar.get_radar_step_directions()["signal"],
+        "windowed_step_directions": radar.get_windowed_radar_step_directions(
+            options["window"]
+        )["signal"],
+    }
+
+
+def _navigation(input: str, options: dict) -> dict:
+    navigation = submarine.Navigation(input=input, column_names=["signal"])
+    navigation.calculate_path(activate_aim=options["aim"], plot=False)
+    depth = horizontal = 0
+    if len(navigation.telemetry):
+        depth = int(navigation.telemetry["depth"][-1])
+        horizontal = int(navigation.telemetry["horizontal"][-1])
+    return {"depth": depth, "horizontal": horizontal, "product": depth * horizontal}
+
+
+def _power_consumption(input: str, options: dict) -> dict:
+    diagnostics = submarine.PowerConsumption(input=input, verbose=False)
+    return {
+        "power_consumption": diagnostics.power_consumption,
+        "gamma_rate": diagnostics.power_consumption_stats["gamma_rate"],
+        "epsilon_rate": diagnostics.power_consumption_stats["epsilon_rate"],
+    }
+
+
+def _life_support(input: str, options: dict) -> dict:
+    diagnostics = submarine.LifeSupport(input=input, verbose=False)
+    return {
+        "life_support_rating": diagnostics.life_support_rating,
+        # the `most_common` search keeps the least popular bits, see `LifeSupport._narrow`
+        "oxygen_generator_rating": diagnostics.least_common["int"],
+        "co2_scrubber_rating": diagnostics.most_common["int"],
+    }
+
+
+def _bingo(input: str, options: dict) -> dict:
+    board_scores = submarine.BingoSolver(input, verbose=False).board_scores
+    if not board_scores:
+        return {"first": None, "last": None}
+    return {"first": board_scores[0], "last": board_scores[-1]}
+
+
+# what every system reports about a single input file
+SYSTEMS = {
+    "Radar": _radar,
+    "Navigation": _navigation,
+    "PowerConsumption": _power_consumption,
+    "LifeSupport": _life_support,
+    "BingoSolver": _bingo,
+}
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def run_system(system: str, input: str, options: dict) -> dict:
+    """Run a system over a single input file, as a worker of the batch runner.
+
+    Anything the system prints is swallowed, so that it doesn't end up in the middle of the JSON lines.
+
+    Args:
+        system (str): The name of the system, see `SYSTEMS`
+        input (str): The path to the input file
+        options (dict): The options of the systems
+
+    Returns:
+        dict: The `input`, the `system` and its `result`, or the `error` it ran into.
+    """
+    line = {"input": input, "system": system}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            line["result"] = SYSTEMS[system](input, options)
+    except Exception as e:
+        line["error"] = f"{type(e).__name__}: {e}"
+    return line
+
+
+def _run_task(task: tuple) -> dict:
+    return run_system(*task)
+
+
+def find_inputs(patterns: List[str]) -> List[str]:
+    """Expand directories and glob patterns into the input files they hold.
+
+    Args:
+        patterns (List[str]): Input files, directories (all the files right inside them) or glob patterns
+
+    Returns:
+        List[str]: The input files, sorted per pattern, each listed once.
+    """
+    inputs = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            paths = glob.glob(pattern)
+        inputs.update(dict.fromkeys(sorted(p for p in paths if os.path.isfile(p))))
+    return list(inputs)
+
+
+def run_batch(
+    system: str,
+    inputs: List[str],
+    options: dict,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    ordered: bool = False,
+) -> Iterator[dict]:
+    """Run a system over many input files across a pool of processes.
+
+    Args:
+        system (str): The name of the system, see `SYSTEMS`
+        inputs (List[str]): The paths to the input files
+        options (dict): The options of the systems
+        workers (Optional[int], optional): The number of worker processes. Defaults to None, one per core.
+        chunksize (int, optional): How many input files to hand to a worker at a time. Defaults to 1.
+        ordered (bool, optional): Yield the results in the order of the inputs, rather than as soon as they're
+            ready. Defaults to False.
+
+    Yields:
+        Iterator[dict]: The outcome of every input file, see `run_system`.
+    """
+    tasks = [(system, input, options) for input in inputs]
+    if workers == 1:
+        yield from map(_run_task, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_run_task, tasks, chunksize=chunksize)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a submarine system over many input files and stream the results as JSON lines."""
+    parser = argparse.ArgumentParser(
+        prog="submarine",
+        description="Run a submarine system over many input files and stream the results as JSON lines.",
+    )
+    parser.add_argument("system", choices=sorted(SYSTEMS), help="the system to run")
+    parser.add_argument(
+        "inputs", nargs="+", help="input files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: one per core)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunksize",
+        type=int,
+        default=1,
+        help="number of input files handed to a worker at a time (default: 1)",
+    )
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="output the results in the order of the inputs",
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=3,
+        help="Radar: the size of the window for the windowed step directions (default: 3)",
+    )
+    parser.add_argument(
+        "--aim", action="store_true", help="Navigation: activate the aiming systems"
+    )
+    args = parser.parse_args(argv)
+
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        parser.error(f"no input files found in {' '.join(args.inputs)}")
+    options = {"window": args.window, "aim": args.aim}
+    failed = False
+    for outcome in run_batch(
+        args.system,
+        inputs,
+        options,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        ordered=args.ordered,
+    ):
+        failed = failed or "error" in outcome
+        sys.stdout.write(json.dumps(outcome, default=_to_json) + "\n")
+        sys.stdout.flush()
+    return 1 if failed else 0
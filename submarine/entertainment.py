@@ -1,98 +1,333 @@
-from typing import Union
+import multiprocessing
+from functools import cached_property
+from typing import Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 
 from submarine.inputs import ReadBingo
 
 
+def _rank_winners(
+    boards: np.ndarray, turns: np.ndarray, draws: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Rank the boards by the turn they win on.
+
+    Args:
+        boards (np.ndarray): The stacked `(boards, rows, cols)` bingo boards.
+        turns (np.ndarray): The turn on which each cell of `boards` gets drawn, or `len(draws)` if never.
+        draws (np.ndarray): The drawn numbers in order.
+
+    Returns:
+        Tuple[np.ndarray]: The indices of the winning boards in the order they win and their scores.
+    """
+    # a line is complete on the turn its last number gets drawn
+    win_turn = np.minimum(turns.max(axis=2).min(axis=1), turns.max(axis=1).min(axis=1))
+    winners = np.nonzero(win_turn < draws.shape[0])[0]
+    winners = winners[np.argsort(win_turn[winners], kind="stable")]
+
+    unmarked = np.where(
+        turns[winners] > win_turn[winners, None, None], boards[winners], 0
+    )
+    scores = unmarked.sum(axis=(1, 2)) * draws[win_turn[winners]]
+    return winners, scores
+
+
 class BingoBoard:
-    def __init__(self, board: Union[np.array, list]) -> None:
+    """A single bingo board that keeps track of its marked numbers and lines."""
+
+    __slots__ = (
+        "board",
+        "shape",
+        "_cells",
+        "_values",
+        "_marked",
+        "_row_scores",
+        "_col_scores",
+        "_unmarked_sum",
+        "_last_marked",
+        "winner",
+        "score",
+    )
+
+    def __init__(self, board: Union[np.ndarray, list]) -> None:
         if isinstance(board, list):
             board = np.array(board)
-        elif isinstance(board, np.array):
+        elif isinstance(board, np.ndarray):
             pass
         else:
             raise TypeError(
-                "Expected board to be numpy array or list but got " + type(board)
+                "Expected board to be numpy array or list but got " + str(type(board))
             )
         if board.shape != (5, 5):
             raise ValueError("Input shape is not 5x5 but " + str(board.shape))
 
         self.board = board.astype(int)
         self.shape = self.board.shape
-        self.marked = []
-        self.unmarked = list(self.board.reshape(5 * 5))
-        self._row_scores = {r: 0 for r in range(self.shape[0])}
-        self._col_scores = {c: 0 for c in range(self.shape[1])}
+        # value -> flat cell positions, built once so a draw is a single lookup
+        self._values = [int(num) for num in self.board.reshape(5 * 5)]
+        self._cells = {}
+        for cell, num in enumerate(self._values):
+            self._cells.setdefault(num, []).append(cell)
+        self._row_scores = [0] * self.shape[0]
+        self._col_scores = [0] * self.shape[1]
         self.winner = {}
-        self.score = None
+        self.reset()
+
+    @property
+    def marked(self) -> list:
+        """The marked numbers of the board."""
+        return [
+            num for cell, num in enumerate(self._values) if self._marked >> cell & 1
+        ]
+
+    @property
+    def unmarked(self) -> list:
+        """The numbers of the board that are not marked yet."""
+        return [
+            num for cell, num in enumerate(self._values) if not self._marked >> cell & 1
+        ]
 
     def check_number(self, num: Union[int, str]):
         if isinstance(num, str):
             num = int(num)
-        results = np.where(self.board == num)
-        if len(results[0]) + len(results[1]) == 0:
+        cells = self._cells.get(num)
+        if cells is None:
             return False
-        if not num in self.marked:
-            self.marked.append(num)
-            self.unmarked.remove(num)
-            for row in results[0]:
+        if not self._marked >> cells[0] & 1:
+            self._last_marked = num
+            for cell in cells:
+                self._marked |= 1 << cell
+                self._unmarked_sum -= num
+                row, col = divmod(cell, self.shape[1])
                 self._row_scores[row] += 1
-            for col in results[1]:
                 self._col_scores[col] += 1
-            self.check_win()
+                if not self.winner:
+                    if self._row_scores[row] == self.shape[1]:
+                        self.winner["row"] = row
+                    elif self._col_scores[col] == self.shape[0]:
+                        self.winner["col"] = col
+            if self.winner and self.score is None:
+                self._calculate_score()
             return True
 
     def reset(self):
-        self.__init__(self.board)
+        """Clear all marks so the board can be replayed, reusing its buffers."""
+        self._marked = 0
+        self._unmarked_sum = sum(self._values)
+        self._last_marked = None
+        for row in range(self.shape[0]):
+            self._row_scores[row] = 0
+        for col in range(self.shape[1]):
+            self._col_scores[col] = 0
+        self.winner.clear()
+        self.score = None
 
     def check_win(self):
-        if self.winner != {}:
-            return True
-
-        for row, score in self._row_scores.items():
-            if score == self.shape[1]:
-                self.winner["row"] = row
-                self._calculate_score()
-                return True
-        for col, score in self._col_scores.items():
-            if score == self.shape[1]:
-                self.winner["col"] = col
-                self._calculate_score()
-                return True
-        return False
+        return self.winner != {}
 
     def _calculate_score(self):
         if self.check_win():
-            self.score = np.sum(self.unmarked) * self.marked[-1]
+            self.score = self._unmarked_sum * self._last_marked
 
 
 class BingoSolver(ReadBingo):
-    def __init__(self, input: str) -> None:
+    def __init__(
+        self, input: str, engine: str = "vectorized", verbose: bool = True
+    ) -> None:
+        """Play bingo with every board of the input and rank the boards by the order they win.
+
+        Args:
+            input (str): The path to the file with the drawn numbers and the bingo boards.
+            engine (str, optional): How to play the game. `"vectorized"` stacks all boards in a single array and
+                derives the winning turn and score of every board at once, while `"boards"` plays each
+                `BingoBoard` draw by draw. Both produce identical `board_scores`. Defaults to "vectorized".
+            verbose (bool, optional): Play the game right away and print the first and last winners.
+                Otherwise the game is only played once `board_scores` is first asked for. Defaults to True.
+        """
+        if engine not in ("vectorized", "boards"):
+            raise ValueError(
+                f"Unknown engine {engine}, expected 'vectorized' or 'boards'"
+            )
         ReadBingo.__init__(self, input=input)
+        self.engine = engine
 
-        self._convert_boards()
-        self._solve()
+        if verbose:
+            print(
+                f"First board to win is #{self.board_scores[0][0]} and scored {self.board_scores[0][1]} points"
+            )
+            print(
+                f"Last board to win is #{self.board_scores[-1][0]} and scored {self.board_scores[-1][1]} points"
+            )
 
-        print(
-            f"First board to win is #{self.board_scores[0][0]} and scored {self.board_scores[0][1]} points"
-        )
-        print(
-            f"Last board to win is #{self.board_scores[-1][0]} and scored {self.board_scores[-1][1]} points"
-        )
+    @cached_property
+    def board_scores(self) -> List[list]:
+        """The `[board number, score]` of every winning board, in the order they win."""
+        if self.engine == "vectorized":
+            self._stack_boards()
+            return self._solve_vectorized()
+        self._convert_boards()
+        return self._solve()
 
     def _convert_boards(self):
         self.boards = []
         for board in self.raw_boards:
             self.boards.append(BingoBoard(board))
 
+    def _stack_boards(self):
+        """Stack all raw boards into a single `(boards, rows, cols)` integer array."""
+        self.board_stack = self.raw_boards
+
+    def _draw_turns(self, boards: np.ndarray) -> np.ndarray:
+        """Map every cell of the boards to the turn on which its number is first drawn.
+
+        Args:
+            boards (np.ndarray): The stacked boards.
+
+        Returns:
+            np.ndarray: An array shaped like `boards` with the draw turn per cell,
+                or the number of draws for numbers that are never drawn.
+        """
+        draws = np.asarray(self.drawn_numbers, dtype=np.int64)
+        numbers, first_turn = np.unique(draws, return_index=True)
+        pos = np.searchsorted(numbers, boards)
+        pos[pos == numbers.shape[0]] = 0
+        return np.where(numbers[pos] == boards, first_turn[pos], draws.shape[0])
+
+    def _solve_vectorized(self):
+        """Find the winning turn and score of every board with a handful of array reductions."""
+        board_scores = []
+        winners, scores = _rank_winners(
+            self.board_stack,
+            self._draw_turns(self.board_stack),
+            np.asarray(self.drawn_numbers, dtype=np.int64),
+        )
+        for board, score in zip(winners, scores):
+            board_scores.append([int(board) + 1, int(score)])
+        return board_scores
+
     def _solve(self):
-        self.board_scores = []
+        board_scores = []
         for draw in self.drawn_numbers:
             board_num = 1
             for board in self.boards:
                 prev_score_state = board.score
                 board.check_number(draw)
                 if board.score != prev_score_state:
-                    self.board_scores.append([board_num, board.score])
+                    board_scores.append([board_num, board.score])
                 board_num += 1
+        return board_scores
+
+
+class BingoSimulator(ReadBingo):
+    """Score the same set of bingo boards against many alternative draw orders."""
+
+    def __init__(self, input: str, chunk_size: int = 1 << 16) -> None:
+        """Load the boards once and index them for fast replays.
+
+        Args:
+            input (str): The path to the file with the bingo boards. Its drawn numbers are kept
+                in `drawn_numbers` but any other sequence can be scored with `score_sequences`.
+            chunk_size (int, optional): How many bytes to parse at a time. Defaults to 64 KiB.
+        """
+        ReadBingo.__init__(self, input=input, chunk_size=chunk_size)
+        self.board_stack = self.raw_boards
+        self._index_numbers()
+
+    def _index_numbers(self):
+        """Build the inverted index from every board number to the flat (board, cell) positions holding it."""
+        flat = self.board_stack.reshape(-1)
+        self._cells_by_number = np.argsort(flat, kind="stable")
+        self._numbers, self._number_starts, self._number_counts = np.unique(
+            flat[self._cells_by_number], return_index=True, return_counts=True
+        )
+
+    def _draw_turns(self, draws: np.ndarray) -> np.ndarray:
+        """Map every cell of the boards to the turn its number is first drawn using the inverted index.
+
+        Args:
+            draws (np.ndarray): The drawn numbers in order.
+
+        Returns:
+            np.ndarray: An array shaped like `board_stack` with the draw turn per cell,
+                or the number of draws for numbers that are never drawn.
+        """
+        turns = np.full(self.board_stack.size, draws.shape[0], dtype=np.int64)
+        numbers, first_turn = np.unique(draws, return_index=True)
+        pos = np.searchsorted(self._numbers, numbers)
+        pos[pos == self._numbers.shape[0]] = 0
+        on_boards = self._numbers[pos] == numbers
+        pos, first_turn = pos[on_boards], first_turn[on_boards]
+
+        # expand each drawn number into the range of cells holding it
+        counts = self._number_counts[pos]
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        cells = self._cells_by_number[
+            np.repeat(self._number_starts[pos], counts) + offsets
+        ]
+        turns[cells] = np.repeat(first_turn, counts)
+        return turns.reshape(self.board_stack.shape)
+
+    def score_sequence(self, drawn_numbers: Iterable[int]) -> Optional[dict]:
+        """Play the boards against a single draw order.
+
+        Args:
+            drawn_numbers (Iterable[int]): The drawn numbers in order.
+
+        Returns:
+            Optional[dict]: The `first` and `last` winning board as `[board number, score]`,
+                or None if no board wins.
+        """
+        draws = np.asarray(list(drawn_numbers), dtype=np.int64)
+        if self.board_stack.shape[0] == 0:
+            return None
+        winners, scores = _rank_winners(
+            self.board_stack, self._draw_turns(draws), draws
+        )
+        if winners.shape[0] == 0:
+            return None
+        return {
+            "first": [int(winners[0]) + 1, int(scores[0])],
+            "last": [int(winners[-1]) + 1, int(scores[-1])],
+        }
+
+    def score_sequences(
+        self,
+        sequences: Iterable[Iterable[int]],
+        processes: int = None,
+        chunksize: int = 64,
+    ) -> List[Optional[dict]]:
+        """Play the boards against many draw orders.
+
+        Args:
+            sequences (Iterable[Iterable[int]]): The draw orders to score.
+            processes (int, optional): Fan the sequences out over a pool with this many worker processes.
+                Defaults to None, which scores them in the current process.
+            chunksize (int, optional): How many sequences to hand to a worker at a time. Defaults to 64.
+
+        Returns:
+            List[Optional[dict]]: The result of `score_sequence` per draw order.
+        """
+        if processes is None or processes <= 1:
+            return [self.score_sequence(sequence) for sequence in sequences]
+        with multiprocessing.Pool(
+            processes, initializer=_init_simulator_worker, initargs=(self,)
+        ) as pool:
+            return pool.map(
+                _score_in_simulator_worker,
+                [list(sequence) for sequence in sequences],
+                chunksize=chunksize,
+            )
+
+
+_worker_simulator = None
+
+
+def _init_simulator_worker(simulator: BingoSimulator):
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _score_in_simulator_worker(sequence: List[int]) -> Optional[dict]:
+    return _worker_simulator.score_sequence(sequence)
@@ -0,0 +1,216 @@
+import struct
+import subprocess
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# the .npy header is written with a fixed size, so the number of frames can be filled in once they're all written
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_HEADER_SIZE = 128
+
+
+class FrameSink(ABC):
+    """Write the frames of a simulation as they're produced, one `uint8` value per cell.
+
+    Only every `every`-th step is kept, and frames are written out right away, so memory use doesn't grow with
+    the length of the simulation.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], every: int = 1) -> None:
+        """Set up the sink.
+
+        Args:
+            shape (Tuple[int, ...]): The shape of every frame
+            every (int, optional): Only keep the frames of the steps that are a multiple of this. Defaults to 1.
+
+        Raises:
+            ValueError: If `every` is not positive
+        """
+        if every < 1:
+            raise ValueError(f"Can't keep every {every} steps, expected at least 1")
+        self.shape = tuple(shape)
+        self.every = every
+        self.frames = 0
+        self.last_step = -1
+        self.closed = False
+
+    def write(self, step: int, frame: np.ndarray) -> bool:
+        """Write the frame of a simulation step, unless it's decimated away.
+
+        Args:
+            step (int): The step of the simulation the frame shows. Steps that were already written are skipped.
+            frame (np.ndarray): The frame, with values that fit in a `uint8`
+
+        Raises:
+            ValueError: If the sink is closed or the frame doesn't have the sink's shape
+
+        Returns:
+            bool: Whether the frame was written.
+        """
+        if self.closed:
+            raise ValueError("Can't write frames to a closed sink")
+        if step <= self.last_step or step % self.every:
+            return False
+        if frame.shape != self.shape:
+            raise ValueError(
+                f"Frames of shape {frame.shape} don't fit a sink of shape {self.shape}"
+            )
+        self._write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+        self.frames += 1
+        self.last_step = step
+        return True
+
+    @abstractmethod
+    def _write(self, frame: bytes) -> None:
+        """Write out the bytes of a frame."""
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __enter__(self) -> "FrameSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FrameFile(FrameSink):
+    """Write frames to a `.npy` file that can be read back memory-mapped."""
+
+    def __init__(
+        self,
+        path: str,
+        shape: Tuple[int, ...],
+        every: int = 1,
+        buffer_size: int = 1 << 20,
+    ) -> None:
+        """Create the frame file, replacing any existing one.
+
+        Args:
+            path (str): Where to write the frames
+            shape (Tuple[int, ...]): The shape of every frame
+            every (int, optional): Only keep the frames of the steps that are a multiple of this. Defaults to 1.
+            buffer_size (int, optional): How many bytes to buffer before writing them to disk. Defaults to 1 MiB.
+
+        Raises:
+            ValueError: If `every` is not positive, or the shape of the frames doesn't fit in the header
+        """
+        FrameSink.__init__(self, shape=shape, every=every)
+        self.path = path
+        # make sure the header still fits once the final number of frames is filled in
+        self._header(frames=np.iinfo(np.int64).max)
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._file.write(self._header())
+
+    def _header(self, frames: Optional[int] = None) -> bytes:
+        """The `.npy` header, padded to a fixed size so it can be rewritten in place.
+
+        Args:
+            frames (Optional[int], optional): The number of frames. Defaults to None, the frames written so far.
+
+        Raises:
+            ValueError: If the header doesn't fit in its fixed size
+
+        Returns:
+            bytes: The header.
+        """
+        header = repr(
+            {
+                "descr": "|u1",
+                "fortran_order": False,
+                "shape": (self.frames if frames is None else frames,) + self.shape,
+            }
+        )
+        size = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2
+        if len(header) >= size:
+            raise ValueError(
+                f"Frames of shape {self.shape} don't fit in a {_NPY_HEADER_SIZE} bytes header"
+            )
+        header = header.ljust(size - 1) + "\n"
+        return _NPY_MAGIC + struct.pack("<H", size) + header.encode("latin1")
+
+    def _write(self, frame: bytes) -> None:
+        self._file.write(frame)
+
+    def close(self) -> None:
+        """Write the final number of frames into the header and close the file."""
+        if self.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+        FrameSink.close(self)
+
+    @staticmethod
+    def read(path: str) -> np.ndarray:
+        """Open a frame file without loading it in memory.
+
+        Args:
+            path (str): The frame file
+
+        Returns:
+            np.ndarray: The frames, memory-mapped, with the frame number as the first axis.
+        """
+        return np.load(path, mmap_mode="r")
+
+
+class FramePipe(FrameSink):
+    """Pipe raw frames to the standard input of an encoder, like `ffmpeg`."""
+
+    def __init__(
+        self, command: List[str], shape: Tuple[int, ...], every: int = 1
+    ) -> None:
+        """Start the encoder.
+
+        Writing blocks while the encoder is busy, so frames never pile up in memory.
+
+        Args:
+            command (List[str]): The encoder command, reading raw frames from its standard input
+            shape (Tuple[int, ...]): The shape of every frame
+            every (int, optional): Only keep the frames of the steps that are a multiple of this. Defaults to 1.
+        """
+        FrameSink.__init__(self, shape=shape, every=every)
+        self.command = command
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    @classmethod
+    def ffmpeg(
+        cls,
+        path: str,
+        shape: Tuple[int, int],
+        every: int = 1,
+        fps: int = 30,
+    ) -> "FramePipe":
+        """Encode the frames into a grayscale video with `ffmpeg`.
+
+        Args:
+            path (str): Where to write the video
+            shape (Tuple[int, int]): The `(rows, cols)` of every frame
+            every (int, optional): Only keep the frames of the steps that are a multiple of this. Defaults to 1.
+            fps (int, optional): The frames per second of the video. Defaults to 30.
+
+        Returns:
+            FramePipe: The frame sink feeding `ffmpeg`.
+        """
+        rows, cols = shape
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo"]
+        command += ["-pix_fmt", "gray", "-s", f"{cols}x{rows}", "-r", str(fps)]
+        command += ["-i", "-", "-pix_fmt", "yuv420p", "-vcodec", "libx264", path]
+        return cls(command, shape=shape, every=every)
+
+    def _write(self, frame: bytes) -> None:
+        self._process.stdin.write(frame)
+
+    def close(self) -> None:
+        """Let the encoder finish.
+
+        Raises:
+            subprocess.CalledProcessError: If the encoder failed
+        """
+        if self.closed:
+            return
+        self._process.stdin.close()
+        FrameSink.close(self)
+        if self._process.wait():
+            raise subprocess.CalledProcessError(self._process.returncode, self.command)
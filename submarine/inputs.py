@@ -1,7 +1,182 @@
-import re
-from typing import List, Union
+from __future__ import annotations
 
-import pandas as pd
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterator, List, Optional, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # pandas is only imported once an input signal gets loaded, bingo does not need it
+    import pandas as pd
+
+
+class InputCache:
+    """On-disk cache of parsed input signals, so the same csv files don't get parsed over and over again.
+
+    Every parsed input is stored as a directory with one `.npy` file per column, which gets memory-mapped when
+    loaded back. Entries are keyed by the input's path, size, modification time and loader options, so a changed
+    input never hits a stale entry, and the least recently used entries are evicted once the cache grows beyond
+    `max_size` bytes.
+    """
+
+    def __init__(self, cache_dir: str = None, max_size: int = 1 << 30) -> None:
+        """Open (or create) a cache.
+
+        Args:
+            cache_dir (str, optional): The directory holding the cache. Defaults to None, which keeps the cache
+                in a `.submarine_cache` directory next to each input.
+            max_size (int, optional): The maximum size of the cache in bytes. Defaults to 1 GiB.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def _dir(self, input: str) -> str:
+        if self.cache_dir is not None:
+            return self.cache_dir
+        return os.path.join(os.path.dirname(os.path.abspath(input)), ".submarine_cache")
+
+    def _path_key(self, input: str) -> str:
+        return hashlib.sha1(os.path.abspath(input).encode()).hexdigest()[:16]
+
+    def _entry(self, input: str, options: dict) -> str:
+        stat = os.stat(input)
+        key = repr((stat.st_size, stat.st_mtime_ns, sorted(options.items())))
+        key = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(self._dir(input), f"{self._path_key(input)}-{key}")
+
+    def load(
+        self, input: str, options: dict
+    ) -> Optional[Union[pd.Series, pd.DataFrame]]:
+        """Load a parsed input from the cache.
+
+        Args:
+            input (str): The path to the input file
+            options (dict): The options the input was parsed with
+
+        Returns:
+            Optional[Union[pd.Series, pd.DataFrame]]: The parsed input, or None on a cache miss.
+        """
+        import pandas as pd
+
+        entry = self._entry(input, options)
+        try:
+            with open(os.path.join(entry, "meta.json"), "r") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        # mark the entry as recently used
+        os.utime(entry)
+
+        columns = {}
+        for c, (col, kind) in enumerate(zip(meta["columns"], meta["kinds"])):
+            values = np.load(os.path.join(entry, f"{c}.npy"), mmap_mode="r")
+            if kind == "O":
+                values = values.astype(object)
+            columns[c] = values
+        if meta["series"]:
+            return pd.Series(columns[0], name=meta["columns"][0], copy=False)
+        df = pd.DataFrame(columns, copy=False)
+        df.columns = meta["columns"]
+        return df
+
+    def store(
+        self, input: str, options: dict, data: Union[pd.Series, pd.DataFrame]
+    ) -> bool:
+        """Store a parsed input in the cache.
+
+        Args:
+            input (str): The path to the input file
+            options (dict): The options the input was parsed with
+            data (Union[pd.Series, pd.DataFrame]): The parsed input
+
+        Returns:
+            bool: Whether the input could be stored, inputs with missing text values or without a default
+                index are not.
+        """
+        import pandas as pd
+
+        series = isinstance(data, pd.Series)
+        df = data.to_frame() if series else data
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0:
+            return False
+
+        arrays = []
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if values.dtype == object:
+                if df[col].isna().any():
+                    return False
+                values = values.astype(str)
+            arrays.append(values)
+
+        cache_dir = self._dir(input)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp-")
+        for c, values in enumerate(arrays):
+            np.save(os.path.join(tmp, f"{c}.npy"), values, allow_pickle=False)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "series": series,
+                    "columns": [
+                        col.item() if isinstance(col, np.generic) else col
+                        for col in df.columns
+                    ],
+                    "kinds": [df[col].dtype.kind for col in df.columns],
+                },
+                f,
+            )
+        entry = self._entry(input, options)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._evict(cache_dir)
+        return True
+
+    def _evict(self, cache_dir: str) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = []
+        for name in os.listdir(cache_dir):
+            entry = os.path.join(cache_dir, name)
+            if name.startswith(".tmp-") or not os.path.isdir(entry):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(entry), size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def invalidate(self, input: str = None) -> None:
+        """Remove the cached entries of an input, or the whole cache.
+
+        Args:
+            input (str, optional): The path to the input file. Defaults to None, which clears the whole cache
+                (only possible with a `cache_dir`).
+        """
+        if input is None:
+            if self.cache_dir is None:
+                raise ValueError("Clearing the whole cache needs a cache_dir")
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            return
+        cache_dir = self._dir(input)
+        if not os.path.isdir(cache_dir):
+            return
+        prefix = self._path_key(input) + "-"
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix):
+                shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
 
 
 class InputSignal:
@@ -14,6 +189,8 @@ class InputSignal:
         column_names: List[str] = None,
         data_type: type = None,
         squeeze: bool = False,
+        chunksize: int = None,
+        cache: Union[bool, InputCache] = False,
     ) -> None:
         """Connect your submarine tools to an input signal
 
@@ -24,15 +201,38 @@ class InputSignal:
             data_type (type, optional): The data type (if known) of the input data. Defaults to None.
                 Read more at https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_csv.html
             squeeze (bool, optional): Attempt to return a pandas Series if the input has only one column.
+            chunksize (int, optional): Stream the input in chunks of this many rows instead of loading it in memory.
+                In that case `input_df` and `input_shape` are None and the input is read through `_input_chunks`.
+                Defaults to None.
+            cache (Union[bool, InputCache], optional): Reuse the parsed input from an `InputCache` when the same
+                file was parsed before with the same options. True uses a cache next to the input. Defaults to False.
         """
         self.input = input
-        self.input_df = self._input_loader(
-            header_location=header_location,
-            column_names=column_names,
-            data_type=data_type,
-            squeeze=squeeze,
-        )
-        self.input_shape = self.input_df.shape
+        self._loader_options = {
+            "header_location": header_location,
+            "column_names": column_names,
+            "data_type": data_type,
+            "squeeze": squeeze,
+        }
+        self.chunksize = chunksize
+        if cache is True:
+            cache = InputCache()
+        self.cache = cache or None
+        if chunksize is None:
+            self.input_df = self._cached_input_loader()
+            self.input_shape = self.input_df.shape
+        else:
+            self.input_df = None
+            self.input_shape = None
+
+    def _cached_input_loader(self) -> Union[pd.Series, pd.DataFrame]:
+        if self.cache is None:
+            return self._input_loader(**self._loader_options)
+        input_df = self.cache.load(self.input, self._loader_options)
+        if input_df is None:
+            input_df = self._input_loader(**self._loader_options)
+            self.cache.store(self.input, self._loader_options, input_df)
+        return input_df
 
     def _input_loader(
         self,
@@ -41,6 +241,8 @@ class InputSignal:
         data_type: type,
         squeeze: bool = False,
     ) -> Union[pd.Series, pd.DataFrame]:
+        import pandas as pd
+
         return pd.read_csv(
             self.input,
             header=header_location,
@@ -49,33 +251,283 @@ class InputSignal:
             squeeze=squeeze,
         )
 
+    def _input_chunks(self) -> Iterator[pd.DataFrame]:
+        """Read the input signal in chunks of `chunksize` rows.
+
+        Yields:
+            pd.DataFrame: The next chunk of the input.
+        """
+        import pandas as pd
+
+        with pd.read_csv(
+            self.input,
+            header=self._loader_options["header_location"],
+            names=self._loader_options["column_names"],
+            dtype=self._loader_options["data_type"],
+            chunksize=self.chunksize,
+        ) as reader:
+            yield from reader
+
 
 class ReadBingo:
-    def __init__(self, input: str) -> None:
+    """Read the drawn numbers and the 5x5 boards of a bingo game."""
+
+    board_shape = (5, 5)
+    board_dtype = np.int32
+
+    def __init__(self, input: str, chunk_size: int = 1 << 16) -> None:
+        """Load a bingo game from a file.
+
+        The first line holds the comma separated drawn numbers and the rest of the file the boards. Only the
+        drawn numbers are read right away, the boards are parsed in chunks of `chunk_size` bytes when they are
+        first needed, either all at once through `raw_boards` or streamed with `iter_boards` and `read_boards`.
+
+        Args:
+            input (str): The path to the file with the bingo game
+            chunk_size (int, optional): How many bytes to parse at a time. Defaults to 64 KiB.
+        """
         self.input = input
-        with open(self.input, "r") as f:
-            self.bingo_data = f.readlines()
+        self.chunk_size = chunk_size
 
         self._get_drawn_numbers()
-        self._get_boards()
 
     def _get_drawn_numbers(self):
-        self.drawn_numbers = self.bingo_data[0]
-        self.drawn_numbers = self.drawn_numbers.replace("\n", "")
-        self.drawn_numbers = self.drawn_numbers.split(",")
-        self.drawn_numbers = [int(num) for num in self.drawn_numbers]
-
-    def _get_boards(self):
-        board = []
-        self.raw_boards = []
-        self.number_of_boards = 0
-        for row in self.bingo_data[1:]:
-            if row == "\n":
-                if self.number_of_boards > 0:
-                    self.raw_boards.append(board)
-                board = []
-                self.number_of_boards += 1
-                continue
-            numbers = re.findall("[0-9]*", row)
-            numbers = [int(num.strip()) for num in numbers if len(num) > 0]
-            board.append(numbers)
+        with open(self.input, "rb") as f:
+            self.drawn_numbers = f.readline().strip().split(b",")
+        self.drawn_numbers = [int(num) for num in self.drawn_numbers if num]
+
+    @cached_property
+    def number_of_boards(self) -> int:
+        """The number of boards in the game, counted without parsing them.
+
+        Raises:
+            ValueError: If the numbers of the boards don't form complete boards
+        """
+        whitespace = np.frombuffer(b" \t\n\r\v\f", dtype=np.uint8)
+        numbers = 0
+        with open(self.input, "rb") as f:
+            f.readline()
+            after_space = True
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                spaces = np.isin(np.frombuffer(chunk, dtype=np.uint8), whitespace)
+                # a number starts wherever a non-whitespace byte follows whitespace
+                numbers += int(np.count_nonzero(~spaces[1:] & spaces[:-1]))
+                numbers += int(after_space and not spaces[0])
+                after_space = bool(spaces[-1])
+        board_size = self.board_shape[0] * self.board_shape[1]
+        if numbers % board_size:
+            raise ValueError(
+                f"Found {numbers % board_size} trailing numbers that do not form a complete board"
+            )
+        return numbers // board_size
+
+    @cached_property
+    def raw_boards(self) -> np.ndarray:
+        """All the boards of the game as a `(boards, 5, 5)` array, parsed on first use into a preallocated array."""
+        boards = np.empty(
+            (self.number_of_boards,) + self.board_shape, dtype=self.board_dtype
+        )
+        self.read_boards(boards)
+        return boards
+
+    def _iter_board_chunks(self) -> Iterator[np.ndarray]:
+        """Parse the boards chunk by chunk.
+
+        Yields:
+            np.ndarray: A flat integer array holding the numbers of one or more complete boards.
+        """
+        board_size = self.board_shape[0] * self.board_shape[1]
+        with open(self.input, "rb") as f:
+            f.readline()
+            partial_token = b""
+            leftover = np.empty(0, dtype=self.board_dtype)
+            while True:
+                chunk = f.read(self.chunk_size)
+                tokens = (partial_token + chunk).split()
+                partial_token = b""
+                if chunk and tokens and not chunk[-1:].isspace():
+                    # the last number may continue in the next chunk
+                    partial_token = tokens.pop()
+                numbers = np.concatenate(
+                    (
+                        leftover,
+                        np.array(tokens, dtype=bytes).astype(self.board_dtype),
+                    )
+                )
+                complete = numbers.shape[0] - numbers.shape[0] % board_size
+                if complete:
+                    yield numbers[:complete]
+                leftover = numbers[complete:]
+                if not chunk:
+                    break
+        if leftover.shape[0]:
+            raise ValueError(
+                f"Found {leftover.shape[0]} trailing numbers that do not form a complete board"
+            )
+
+    def iter_boards(self) -> Iterator[np.ndarray]:
+        """Lazily read the boards one by one, without keeping the whole game in memory.
+
+        Yields:
+            np.ndarray: A `(5, 5)` integer array per board.
+        """
+        for numbers in self._iter_board_chunks():
+            yield from numbers.reshape((-1,) + self.board_shape)
+
+    def read_boards(self, out: np.ndarray) -> int:
+        """Fill a preallocated `(n_boards, 5, 5)` buffer with the boards of the game.
+
+        Args:
+            out (np.ndarray): The buffer to fill, its first dimension is the maximum number of boards.
+
+        Raises:
+            ValueError: In case the buffer has the wrong shape or the game has more boards than fit in it.
+
+        Returns:
+            int: The number of boards written to the buffer.
+        """
+        if out.shape[1:] != self.board_shape:
+            raise ValueError(
+                f"Expected a buffer of shape (n_boards, 5, 5) but got {out.shape}"
+            )
+        filled = 0
+        for numbers in self._iter_board_chunks():
+            boards = numbers.reshape((-1,) + self.board_shape)
+            if filled + boards.shape[0] > out.shape[0]:
+                raise ValueError(
+                    f"The buffer only fits {out.shape[0]} boards but the game has more"
+                )
+            out[filled : filled + boards.shape[0]] = boards
+            filled += boards.shape[0]
+        return filled
+
+
+class ReadVents:
+    """Read the lines of hydrothermal vents such as `0,9 -> 5,9`."""
+
+    def __init__(self, input: str) -> None:
+        """Load the vent lines from a file.
+
+        Args:
+            input (str): The path to the file with one vent line per row
+        """
+        self.input = input
+        self._get_segments()
+
+    def _get_segments(self):
+        with open(self.input, "rb") as f:
+            data = f.read()
+        numbers = data.replace(b"->", b" ").replace(b",", b" ").split()
+        if len(numbers) % 4:
+            raise ValueError(
+                f"Expected 4 coordinates per vent line but got {len(numbers)} numbers in total"
+            )
+        # segments are shaped (lines, [start, end], [x, y])
+        self.segments = (
+            np.array(numbers, dtype=bytes).astype(np.int64).reshape(-1, 2, 2)
+        )
+        self.number_of_segments = self.segments.shape[0]
+
+
+class ReadLanternfish:
+    """Read the comma separated ages of a school of lanternfish."""
+
+    def __init__(self, input: str) -> None:
+        """Load the ages of the lanternfish from a file.
+
+        Args:
+            input (str): The path to the file with the ages
+        """
+        self.input = input
+        self._get_ages()
+
+    def _get_ages(self):
+        self.ages = _read_comma_separated(self.input)
+
+
+class ReadCrabs:
+    """Read the comma separated horizontal positions of a swarm of crabs."""
+
+    def __init__(self, input: str) -> None:
+        """Load the positions of the crabs from a file.
+
+        Args:
+            input (str): The path to the file with the positions
+        """
+        self.input = input
+        self._get_positions()
+
+    def _get_positions(self):
+        self.positions = _read_comma_separated(self.input)
+
+
+def _read_comma_separated(input: str) -> np.ndarray:
+    """Read a file of comma separated integers into an integer array.
+
+    Raises:
+        ValueError: If a value is not an integer
+    """
+    with open(input, "rb") as f:
+        values = f.read().strip()
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    return np.array(values.split(b","), dtype=bytes).astype(np.int64)
+
+
+def _iter_line_blocks(
+    input: str, start: int, end: int, block_size: int = 1 << 24
+) -> Iterator[List[bytes]]:
+    """Read the lines of a file that start within a byte range, a block at a time.
+
+    Consecutive byte ranges split the lines of a file between them, so that workers can each read their own
+    range of a file without reading or parsing the rest of it.
+
+    Args:
+        input (str): The path to the file
+        start (int): The first byte of the range
+        end (int): The end of the range, exclusive
+        block_size (int, optional): About how many bytes to read at a time. Defaults to 16 MiB.
+
+    Yields:
+        Iterator[List[bytes]]: The next block of non-empty lines, without their line endings.
+    """
+    with open(input, "rb") as f:
+        if start > 0:
+            # a line that started before the range belongs to the previous one
+            f.seek(start - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+        position = f.tell()
+        while position < end:
+            block = f.read(min(block_size, end - position))
+            if not block:
+                break
+            if not block.endswith(b"\n"):
+                block += f.readline()
+            position = f.tell()
+            lines = [line for line in block.splitlines() if line]
+            if lines:
+                yield lines
+
+
+class ReadOctopuses:
+    """Read the energy levels of a grid of dumbo octopuses, one digit per octopus."""
+
+    def __init__(self, input: str) -> None:
+        """Load the grid of energy levels from a file.
+
+        Args:
+            input (str): The path to the file with one row of digits per line
+        """
+        self.input = input
+        self._get_grid()
+
+    def _get_grid(self):
+        with open(self.input, "rb") as f:
+            rows = np.array(f.read().split(), dtype=bytes)
+        self.grid = (
+            rows.view(np.uint8).reshape(rows.shape[0], rows.dtype.itemsize) - ord("0")
+        ).astype(np.int16)
@@ -1,3 +1,11 @@
+import json
+import os
+from collections import deque
+from typing import Iterable, Tuple
+
+import numpy as np
+
+
 class PowerConsumptionData:
     def __init__(self) -> None:
         self.power_consumption_stats = {
@@ -11,17 +19,208 @@ class PowerConsumptionData:
         }
 
 
+class TelemetryStore:
+    """Columns of telemetry values, kept in typed arrays rather than lists of Python ints.
+
+    The arrays are preallocated and grow geometrically, so appending costs amortized O(1). A store can be
+    persisted to a directory with one `.npy` file per column, and reopened memory-mapped without parsing it.
+    """
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(
+        self, columns: Iterable[str], capacity: int = 1024, dtype: type = np.int64
+    ) -> None:
+        """Allocate an empty store.
+
+        Args:
+            columns (Iterable[str]): The names of the columns
+            capacity (int, optional): How many values to make room for upfront. Defaults to 1024.
+            dtype (type, optional): The type of the values. Defaults to np.int64.
+        """
+        self._columns = {column: np.empty(capacity, dtype=dtype) for column in columns}
+        self._length = 0
+
+    @classmethod
+    def from_arrays(cls, **arrays: np.ndarray) -> "TelemetryStore":
+        """Wrap whole columns in a store, without copying them.
+
+        Raises:
+            ValueError: If the columns don't have the same length
+
+        Returns:
+            TelemetryStore: The store holding the columns.
+        """
+        lengths = {column.shape[0] for column in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"The columns have different lengths {sorted(lengths)}")
+        store = cls((), capacity=0)
+        store._columns = {column: np.asanyarray(a) for column, a in arrays.items()}
+        store._length = lengths.pop() if lengths else 0
+        return store
+
+    @classmethod
+    def open(cls, path: str, mode: str = "r") -> "TelemetryStore":
+        """Reopen a persisted store, memory-mapping its columns.
+
+        Appending to a reopened store first copies it into memory.
+
+        Args:
+            path (str): The directory the store was persisted to
+            mode (str, optional): The memory-map mode, see `np.load`. Defaults to "r".
+
+        Returns:
+            TelemetryStore: The reopened store.
+        """
+        with open(os.path.join(path, "columns.json")) as f:
+            columns = json.load(f)
+        return cls.from_arrays(
+            **{
+                column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode=mode)
+                for column in columns
+            }
+        )
+
+    def persist(self, path: str) -> None:
+        """Write the store to a directory, one `.npy` file per column.
+
+        Args:
+            path (str): The directory to write to, created if needed
+        """
+        os.makedirs(path, exist_ok=True)
+        for column in self._columns:
+            np.save(os.path.join(path, f"{column}.npy"), self[column])
+        with open(os.path.join(path, "columns.json"), "w") as f:
+            json.dump(list(self._columns), f)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self._columns)
+
+    @property
+    def capacity(self) -> int:
+        """How many values fit in the columns before they need to grow."""
+        return min((column.shape[0] for column in self._columns.values()), default=0)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the stored values."""
+        return sum(self[column].nbytes for column in self._columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._columns[column][: self._length]
+
+    def as_dict(self) -> dict:
+        return {column: self[column] for column in self._columns}
+
+    def reserve(self, capacity: int) -> None:
+        """Make room for at least `capacity` values, at least doubling the columns when they have to grow.
+
+        Args:
+            capacity (int): The number of values to make room for
+        """
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2 * self.capacity, 16)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._length] = column[: self._length]
+            self._columns[name] = grown
+
+    def _check_columns(self, columns: Iterable[str]) -> None:
+        if set(columns) != set(self._columns):
+            raise ValueError(
+                f"Expected values for the columns {sorted(self._columns)}, got {sorted(columns)}"
+            )
+
+    def append(self, **values: int) -> None:
+        """Add one value to every column.
+
+        Raises:
+            ValueError: If not every column gets a value
+        """
+        self._check_columns(values)
+        self.reserve(self._length + 1)
+        for column, value in values.items():
+            self._columns[column][self._length] = value
+        self._length += 1
+
+    def extend(self, **arrays: np.ndarray) -> None:
+        """Add the same number of values to every column.
+
+        Raises:
+            ValueError: If not every column gets values, or they don't get the same number of values
+        """
+        self._check_columns(arrays)
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"The columns have different lengths {sorted(lengths)}")
+        length = self._length + lengths.pop()
+        self.reserve(length)
+        for column, values in arrays.items():
+            self._columns[column][self._length : length] = values
+        self._length = length
+
+
 class NavigationData:
-    def __init__(self) -> None:
-        self.navigation_trace = {
-            "depth": [],
-            "horizontal": [],
-            "aim": [],
-        }
+    def __init__(
+        self,
+        trace_size: int = None,
+        trace_columns: Tuple[str, ...] = ("depth", "horizontal", "aim"),
+    ) -> None:
+        """Keep track of the navigation trace.
+
+        The whole trace is kept in a `TelemetryStore`, the `telemetry`, while the most recent trace points are
+        kept in ring buffers.
+
+        Args:
+            trace_size (int, optional): Only keep this many of the most recent trace points in a ring buffer.
+                Defaults to None, which keeps the whole trace.
+            trace_columns (Tuple[str, ...], optional): The values that are traced.
+                Defaults to ("depth", "horizontal", "aim").
+        """
+        self.trace_size = trace_size
+        self.trace_columns = trace_columns
+        self._reset_trace()
+
+    @property
+    def navigation_trace(self) -> dict:
+        """The trace of every navigation value. Values that aren't traced have an empty trace."""
+        if self.telemetry is None:
+            return self._ring
+        trace = {k: np.empty(0, dtype=np.int64) for k in ("depth", "horizontal", "aim")}
+        trace.update(self.telemetry.as_dict())
+        return trace
 
     def _reset_trace(self) -> None:
-        for k in self.navigation_trace.keys():
-            self.navigation_trace[k] = []
+        if self.trace_size is None:
+            self.telemetry = TelemetryStore(self.trace_columns)
+            self._ring = None
+        else:
+            self.telemetry = None
+            self._ring = {
+                k: deque(maxlen=self.trace_size) for k in ("depth", "horizontal", "aim")
+            }
+
+    def _trace(self, **values: int) -> None:
+        """Add one point to the trace."""
+        if self.telemetry is None:
+            for k, v in values.items():
+                self._ring[k].append(v)
+        else:
+            self.telemetry.append(**values)
+
+    def _trace_batch(self, **traces: np.ndarray) -> None:
+        """Add a batch of points to the trace."""
+        if self.telemetry is None:
+            # only the tail of the batch can survive in the ring buffer
+            for k, v in traces.items():
+                self._ring[k].extend(v[-self.trace_size :].tolist())
+        else:
+            self.telemetry.extend(**traces)
 
 
 class RadarData:
@@ -0,0 +1,263 @@
+import hashlib
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from submarine.frames import FrameSink
+from submarine.inputs import ReadOctopuses
+
+
+class OctopusCavern(ReadOctopuses):
+    """Simulate the flashing dumbo octopuses of one or many caverns at once."""
+
+    flash_level = 9
+
+    def __init__(
+        self,
+        input: Union[str, np.ndarray],
+        history: int = 1 << 16,
+        eviction: str = "thin",
+    ) -> None:
+        """Start the simulation from the octopuses' current energy levels.
+
+        The simulation remembers a hash of the states it went through, so once the octopuses fall into a cycle
+        long runs can skip ahead whole periods at once.
+
+        Args:
+            input (Union[str, np.ndarray]): The path to the file with the energy levels, or the energy levels
+                themselves as a `(rows, cols)` grid or a `(caverns, rows, cols)` batch of independent grids.
+            history (int, optional): The maximum number of states to remember, 0 disables cycle detection.
+                Defaults to 65536.
+            eviction (str, optional): What to forget when the history is full. `"oldest"` drops the oldest
+                state, so only cycles shorter than the history are found. `"thin"` drops every other state and
+                from then on only remembers every other step, which finds cycles of any length at the cost of
+                some extra steps before noticing them. Defaults to `"thin"`.
+
+        Raises:
+            ValueError: If the eviction policy is unknown, or the history is too short to be thinned
+        """
+        if eviction not in ("oldest", "thin"):
+            raise ValueError(
+                f"Unknown eviction policy {eviction}, expected 'oldest' or 'thin'"
+            )
+        if eviction == "thin" and 0 < history < 3:
+            # the first state is never thinned away, so it takes two more states to ever find a cycle
+            raise ValueError(
+                f"Can't thin a history of {history} states, expected at least 3 or 0 to disable it"
+            )
+        if isinstance(input, str):
+            ReadOctopuses.__init__(self, input=input)
+        else:
+            self.input = None
+            self.grid = np.asarray(input, dtype=np.int16)
+        self.batched = self.grid.ndim == 3
+        grids = self.grid.reshape((-1,) + self.grid.shape[-2:])
+        # the energy levels are kept padded with a border of octopus-free cells, flattened, so that the
+        # neighbours of any octopus are at fixed offsets from it
+        self._padded = np.pad(grids.astype(np.int32), ((0, 0), (1, 1), (1, 1)))
+        self._flat = self._padded.reshape(-1)
+        self._interior = np.pad(
+            np.ones(grids.shape, dtype=bool), ((0, 0), (1, 1), (1, 1))
+        ).reshape(-1)
+        width = self._padded.shape[2]
+        self._offsets = np.array(
+            [dr * width + dc for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+        )
+        self.steps = 0
+        self.flashes = np.zeros(grids.shape[0], dtype=np.int64)
+        self.history = history
+        self.eviction = eviction
+        # state hash -> (step, flashes so far) of the states seen, only every `_stride` steps are remembered
+        self._states = {}
+        self._stride = 1
+
+    @property
+    def energy(self) -> np.ndarray:
+        """The current energy levels, as a `(caverns, rows, cols)` batch."""
+        return self._padded[:, 1:-1, 1:-1]
+
+    @property
+    def frame(self) -> np.ndarray:
+        """The current energy levels, shaped like the input."""
+        return self.energy if self.batched else self.energy[0]
+
+    def _neighbours(self, flashing: np.ndarray) -> np.ndarray:
+        """Count the flashing neighbours of every octopus, diagonals included.
+
+        Args:
+            flashing (np.ndarray): Which cells of the padded caverns are flashing
+
+        Returns:
+            np.ndarray: The number of flashing neighbours, shaped like `energy`
+        """
+        rows, cols = self.energy.shape[1:]
+        count = np.zeros(self.energy.shape, dtype=self._padded.dtype)
+        for dr in range(3):
+            for dc in range(3):
+                if dr != 1 or dc != 1:
+                    count += flashing[:, dr : dr + rows, dc : dc + cols]
+        return count
+
+    def _step(self) -> np.ndarray:
+        """Move the simulation one step forward.
+
+        Every octopus gains one energy, the ones above the flash level flash and give one energy to their
+        neighbours, which may flash in turn. Each round of the cascade only visits the neighbours of the
+        octopuses that just flashed, and every octopus that flashed ends the step at 0.
+
+        Returns:
+            np.ndarray: The flat positions of the octopuses that flashed
+        """
+        self._flat += 1
+        flashed = (self._flat > self.flash_level) & self._interior
+        flashing = np.flatnonzero(flashed)
+        while flashing.shape[0]:
+            if flashing.shape[0] * self._offsets.shape[0] > self._flat.shape[0]:
+                # most of the cavern is flashing, spread the energy with shifted views of the whole grid
+                mask = np.zeros(self._flat.shape, dtype=bool)
+                mask[flashing] = True
+                self.energy[...] += self._neighbours(mask.reshape(self._padded.shape))
+                flashing = np.flatnonzero((self._flat > self.flash_level) & ~flashed)
+            else:
+                neighbours = (flashing[:, None] + self._offsets).reshape(-1)
+                neighbours, energy = np.unique(
+                    neighbours[self._interior[neighbours]], return_counts=True
+                )
+                self._flat[neighbours] += energy
+                flashing = neighbours[
+                    (self._flat[neighbours] > self.flash_level) & ~flashed[neighbours]
+                ]
+            flashed[flashing] = True
+        flashed = np.flatnonzero(flashed)
+        self._flat[flashed] = 0
+        # the border gained energy with everyone else, but it has no octopuses
+        self._flat[~self._interior] = 0
+
+        self.steps += 1
+        self.flashes += np.bincount(
+            flashed // self._padded[0].size, minlength=self.flashes.shape[0]
+        )
+        return flashed
+
+    def _remember(self) -> Optional[Tuple[int, np.ndarray]]:
+        """Remember the current state of the caverns, unless it was already seen.
+
+        Returns:
+            Optional[Tuple[int, np.ndarray]]: The step at which the current state was seen before and the
+                flashes counted up to then, or None if it's a new state.
+        """
+        if not self.history:
+            return None
+        state = hashlib.blake2b(self._padded.tobytes(), digest_size=16).digest()
+        seen = self._states.get(state)
+        if seen is not None:
+            # a state remembered at this very step is not a cycle
+            return seen if seen[0] != self.steps else None
+        if len(self._states) >= self.history:
+            if self.eviction == "oldest":
+                del self._states[next(iter(self._states))]
+            else:
+                while len(self._states) >= self.history:
+                    self._stride *= 2
+                    thinned = {
+                        state: seen
+                        for state, seen in self._states.items()
+                        if seen[0] % self._stride == 0
+                    }
+                    # the state of step 0 is never thinned away, so stop once nothing else is left
+                    if len(thinned) == len(self._states):
+                        break
+                    self._states = thinned
+        if self.steps % self._stride == 0:
+            self._states[state] = (self.steps, self.flashes.copy())
+        return None
+
+    def step(self) -> np.ndarray:
+        """Move the simulation one step forward, see `_step`.
+
+        Returns:
+            np.ndarray: Which octopuses flashed during the step, shaped like the energy levels.
+        """
+        flashed = np.zeros(self._flat.shape, dtype=bool)
+        flashed[self._step()] = True
+        flashed = flashed.reshape(self._padded.shape)[:, 1:-1, 1:-1]
+        return flashed if self.batched else flashed[0]
+
+    def run(
+        self, steps: int, frames: Optional[FrameSink] = None
+    ) -> Union[int, np.ndarray]:
+        """Simulate a number of steps.
+
+        Once the caverns are back in a state seen before, whole periods of the cycle are skipped, so the number
+        of steps can be arbitrarily large.
+
+        Args:
+            steps (int): The number of steps to simulate
+            frames (Optional[FrameSink], optional): Write the energy levels of every step, starting with the
+                current ones, to this sink. Every step is simulated then. Defaults to None.
+
+        Returns:
+            Union[int, np.ndarray]: The number of flashes during these steps, per cavern for a batch.
+        """
+        flashes = self.flashes.copy()
+        target = self.steps + steps
+        if frames is not None:
+            frames.write(self.steps, self.frame)
+            while self.steps < target:
+                self._step()
+                frames.write(self.steps, self.frame)
+        seen = self._remember()
+        while self.steps < target and seen is None:
+            self._step()
+            seen = self._remember()
+        if seen is not None:
+            # the same states come back every period, with the same flashes in between
+            period = self.steps - seen[0]
+            periods = (target - self.steps) // period
+            self.flashes += periods * (self.flashes - seen[1])
+            self.steps += periods * period
+        while self.steps < target:
+            self._step()
+        flashes = self.flashes - flashes
+        return flashes if self.batched else int(flashes[0])
+
+    def first_synchronized_step(
+        self, max_steps: Optional[int] = None
+    ) -> Union[int, np.ndarray]:
+        """Simulate until all octopuses flash during the same step.
+
+        The simulation stops early once the caverns went through a whole cycle of states, as nothing new can
+        happen after that.
+
+        Args:
+            max_steps (Optional[int], optional): Give up after simulating this many steps. Defaults to None,
+                to simulate until the octopuses synchronize or cycle.
+
+        Returns:
+            Union[int, np.ndarray]: The first step (counting from the start of the simulation) when all octopuses
+                flashed, per cavern for a batch, or -1 if that never happens (or not within `max_steps`).
+        """
+        synchronized = np.full(self.flashes.shape[0], -1, dtype=np.int64)
+        octopuses = self.energy[0].size
+        start = self.steps
+        last = None if max_steps is None else start + max_steps
+        cycling = False
+        seen = self._remember()
+        while last is None or self.steps < last:
+            if seen is not None and not cycling:
+                # once a whole period of the cycle was checked, the next steps only repeat checked ones
+                cycling = True
+                end = max(start, seen[0]) + self.steps - seen[0]
+                last = end if last is None else min(last, end)
+                continue
+            flashes = np.bincount(
+                self._step() // self._padded[0].size,
+                minlength=self.flashes.shape[0],
+            )
+            synced = (flashes == octopuses) & (synchronized < 0)
+            synchronized[synced] = self.steps
+            if (synchronized >= 0).all():
+                break
+            if not cycling:
+                seen = self._remember()
+        return synchronized if self.batched else int(synchronized[0])
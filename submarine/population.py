@@ -0,0 +1,100 @@
+from typing import Iterable
+
+import numpy as np
+
+from submarine.inputs import ReadLanternfish
+
+
+class LanternfishSchool(ReadLanternfish):
+    """Forecast the size of a school of lanternfish, however far in the future."""
+
+    # a fish spawns when its timer runs out, then restarts at 6 and its newborn starts at 8
+    reset_age = 6
+    newborn_age = 8
+
+    def __init__(self, input: str, modulus: int = None) -> None:
+        """Count the fish per age and set up the daily transition between ages.
+
+        Every day moves the counts of the 9 age buckets through a fixed transition matrix, so the population
+        after N days takes O(log N) matrix multiplications with exponentiation by squaring. The counts are exact
+        Python integers, however large they grow.
+
+        Args:
+            input (str): The path to the file with the ages
+            modulus (int, optional): Only forecast the population modulo this number. Defaults to None.
+        """
+        ReadLanternfish.__init__(self, input=input)
+        self.modulus = modulus
+
+        buckets = self.newborn_age + 1
+        self.school = np.array(
+            [int(count) for count in np.bincount(self.ages, minlength=buckets)],
+            dtype=object,
+        )
+        if self.school.shape[0] > buckets:
+            raise ValueError(
+                f"Lanternfish ages go up to {self.newborn_age} but found {self.ages.max()}"
+            )
+        # transition[to, from]
+        transition = np.zeros((buckets, buckets), dtype=int)
+        for age in range(1, buckets):
+            transition[age - 1, age] = 1
+        transition[self.reset_age, 0] = 1
+        transition[self.newborn_age, 0] = 1
+        self._powers = [self._reduce(transition.astype(object))]
+
+    def _reduce(self, counts: np.ndarray) -> np.ndarray:
+        if self.modulus is None:
+            return counts
+        return counts % self.modulus
+
+    def _power(self, bit: int) -> np.ndarray:
+        """The transition over `2 ** bit` days, squared up from the daily transition once and then reused."""
+        while len(self._powers) <= bit:
+            self._powers.append(self._reduce(self._powers[-1] @ self._powers[-1]))
+        return self._powers[bit]
+
+    def _advance(self, school: np.ndarray, days: int) -> np.ndarray:
+        bit = 0
+        while days:
+            if days & 1:
+                school = self._reduce(self._power(bit) @ school)
+            days >>= 1
+            bit += 1
+        return school
+
+    def population(self, days: int) -> int:
+        """Forecast the number of lanternfish.
+
+        Args:
+            days (int): The number of days from now
+
+        Returns:
+            int: The number of lanternfish (modulo `modulus` if set)
+        """
+        if days < 0:
+            raise ValueError(f"Can only forecast the future, got {days} days")
+        return self._reduce(sum(self._advance(self.school, days)))
+
+    def forecast(self, days: Iterable[int]) -> dict:
+        """Forecast the number of lanternfish for many days at once.
+
+        The days are visited in order and each one advances the school from the previous one, so every
+        forecast only costs O(log) of the gap to the previous day.
+
+        Args:
+            days (Iterable[int]): The numbers of days from now
+
+        Returns:
+            dict: The number of lanternfish per day
+        """
+        forecast = {}
+        school = self.school
+        previous = 0
+        for day in sorted(set(days)):
+            if day < 0:
+                raise ValueError(f"Can only forecast the future, got {day} days")
+            school = self._advance(school, day - previous)
+            previous = day
+            forecast[day] = self._reduce(sum(school))
+        return forecast
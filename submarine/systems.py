@@ -1,13 +1,18 @@
-from typing import List, Union
+import asyncio
+import multiprocessing
+import os
+from functools import cached_property
+from typing import Iterable, List, Tuple, Union
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
-from submarine.inputs import InputSignal
+from submarine.inputs import InputCache, InputSignal, _iter_line_blocks
 from submarine.memory import (
     NavigationData,
     PowerConsumptionData,
     RadarData,
+    TelemetryStore,
 )
 
 
@@ -21,7 +26,29 @@ class Diagnostics(InputSignal):
         column_names: List[str] = None,
         data_type: type = str,
         squeeze: bool = True,
+        cache: Union[bool, InputCache] = False,
     ) -> None:
+        """Connect the diagnostics to a diagnostic report.
+
+        Args:
+            input (Union[str, Diagnostics]): The path to the diagnostic report, or an already parsed report
+                (any `Diagnostics`) to share instead of reading the file again. The other options are ignored then.
+            header_location (int, optional): The row on which the csv header appears. Defaults to None.
+            column_names (List[str], optional): The name for the columns in the csv file. Defaults to None.
+            data_type (type, optional): The data type of the report. Defaults to str.
+            squeeze (bool, optional): Return a pandas Series for the single column report. Defaults to True.
+            cache (Union[bool, InputCache], optional): Reuse the parsed report from an `InputCache`. Defaults to False.
+        """
+        if isinstance(input, Diagnostics):
+            self._report = input._report
+            self.input = self._report.input
+            self._loader_options = self._report._loader_options
+            self.chunksize = self._report.chunksize
+            self.cache = self._report.cache
+            self.input_df = self._report.input_df
+            self.input_shape = self._report.input_shape
+            return
+
         InputSignal.__init__(
             self,
             input=input,
@@ -29,13 +56,44 @@ class Diagnostics(InputSignal):
             column_names=column_names,
             data_type=data_type,
             squeeze=squeeze,
+            cache=cache,
         )
+        self._report = self
+        self._bits = None
+        self._sorted_rows = None
+
+    def _bit_matrix(self) -> np.ndarray:
+        """Decode the diagnostic report into a matrix with one row of bits per report line, once per report.
+
+        Returns:
+            np.ndarray: A `uint8` matrix of `(lines, bits_per_line)` holding the bits,
+                lines shorter than the longest one are padded with values other than 0 and 1.
+        """
+        report = self._report
+        if report._bits is None:
+            raw = report.input_df.to_numpy(dtype=bytes)
+            report._bits = raw.view(np.uint8).reshape(
+                raw.shape[0], raw.dtype.itemsize
+            ) - ord("0")
+        return report._bits
+
+    def _sorted_report(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sort the lines of the diagnostic report, once per report.
+
+        Returns:
+            Tuple[np.ndarray]: The sorted lines as a bytes array and their bit matrix.
+        """
+        report = self._report
+        if report._sorted_rows is None:
+            rows = np.sort(report.input_df.to_numpy(dtype=bytes))
+            bits = rows.view(np.uint8).reshape(rows.shape[0], rows.dtype.itemsize)
+            report._sorted_rows = (rows, bits - ord("0"))
+        return report._sorted_rows
 
     def _binary_str_to_int(self, binary: str) -> int:
         """Convert binary code to integer.
-        It treats that input as a binary number (base 2) and converts it to a decimal integer (base 10). It
-        returns an integer result.
-        Copied from https://stackoverflow.com/a/32834431
+        It treats that input as a binary number (base 2) and converts it to a decimal integer (base 10),
+        without any limit on the number of bits.
 
         Args:
             binary (str): The binary number to be converted to integer.
@@ -43,12 +101,9 @@ class Diagnostics(InputSignal):
         Returns:
             int: The converted integer.
         """
-        length = len(binary)
-        num = 0
-        for i in range(length):
-            num = num + int(binary[i])
-            num = num * 2
-        return int(num / 2)
+        if not binary:
+            return 0
+        return int(binary, 2)
 
 
 class PowerConsumption(Diagnostics, PowerConsumptionData):
@@ -62,6 +117,7 @@ class PowerConsumption(Diagnostics, PowerConsumptionData):
         data_type: type = str,
         squeeze: bool = True,
         verbose: bool = True,
+        cache: Union[bool, InputCache] = False,
     ) -> None:
         Diagnostics.__init__(
             self,
@@ -70,72 +126,76 @@ class PowerConsumption(Diagnostics, PowerConsumptionData):
             column_names=column_names,
             data_type=data_type,
             squeeze=squeeze,
+            cache=cache,
         )
         PowerConsumptionData.__init__(self)
 
-        # Calculate power consumption stats from input
-        self.power_consumption_stats["bits_per_line"] = (
-            self.input_df.astype(str).apply(len).max()
-        )
+        if verbose:
+            print("Submarine's current power consumption is", self.power_consumption)
+
+    @property
+    def power_consumption_stats(self) -> dict:
+        """The statistics of the diagnostic report behind the power consumption, calculated on first use."""
+        self.power_consumption
+        return self._power_consumption_stats
+
+    @power_consumption_stats.setter
+    def power_consumption_stats(self, stats: dict) -> None:
+        self._power_consumption_stats = stats
+
+    @cached_property
+    def power_consumption(self) -> int:
+        """The power consumption of the submarine, calculated on first use along with `power_consumption_stats`."""
+        self._power_consumption_stats["bits_per_line"] = self._bit_matrix().shape[1]
         self._count_bits()
         self._calculate_popularity()
         self._calculate_rates()
-        self.power_consumption = self._power_consumption()
-        if verbose:
-            print("Submarine's current power consumption is", self.power_consumption)
+        return self._power_consumption()
 
     def _count_bits(self):
         """Count the occurrence of 0 and 1 bits per position over all rows of the input."""
-        for input in self.input_df:
-            for pos, digit in enumerate(str(input)):
-                try:
-                    self.power_consumption_stats["bits_per_position"][digit][
-                        str(pos)
-                    ] += 1
-                except KeyError:
-                    self.power_consumption_stats["bits_per_position"][digit][
-                        str(pos)
-                    ] = 1
+        bits = self._bit_matrix()
+        self._bit_counts = {
+            digit: np.count_nonzero(bits == int(digit), axis=0) for digit in ("0", "1")
+        }
+        for digit, counts in self._bit_counts.items():
+            self._power_consumption_stats["bits_per_position"][digit] = {
+                str(pos): int(count) for pos, count in enumerate(counts) if count
+            }
 
     def _calculate_popularity(self):
         """Measure which bits (0,1) are the most common per position."""
-        for pos in range(self.power_consumption_stats["bits_per_line"]):
-            if (
-                self.power_consumption_stats["bits_per_position"]["0"][str(pos)]
-                > self.power_consumption_stats["bits_per_position"]["1"][str(pos)]
-            ):
-                self.power_consumption_stats["most_common_bits"].append("0")
-                self.power_consumption_stats["least_common_bits"].append("1")
-            elif (
-                self.power_consumption_stats["bits_per_position"]["0"][str(pos)]
-                < self.power_consumption_stats["bits_per_position"]["1"][str(pos)]
-            ):
-                self.power_consumption_stats["most_common_bits"].append("1")
-                self.power_consumption_stats["least_common_bits"].append("0")
+        zeros, ones = self._bit_counts["0"], self._bit_counts["1"]
+        # positions where both bits are equally common have no most common bit
+        decided = zeros != ones
+        most_common = np.where(ones > zeros, "1", "0")[decided]
+        least_common = np.where(ones > zeros, "0", "1")[decided]
+        self._power_consumption_stats["most_common_bits"] = most_common.tolist()
+        self._power_consumption_stats["least_common_bits"] = least_common.tolist()
 
     def _calculate_rates(self):
         """Calculate the gamma and epsilon rates."""
-        self.power_consumption_stats["epsilon_rate"] = "".join(
-            self.power_consumption_stats["least_common_bits"]
+        self._power_consumption_stats["epsilon_rate"] = "".join(
+            self._power_consumption_stats["least_common_bits"]
         )
-        self.power_consumption_stats["gamma_rate"] = "".join(
-            self.power_consumption_stats["most_common_bits"]
+        self._power_consumption_stats["gamma_rate"] = "".join(
+            self._power_consumption_stats["most_common_bits"]
         )
 
     def _power_consumption(self):
         """Calculate the total power consumption of the submarine reported by the diagnostics."""
-        if not self.power_consumption_stats["power_consumption"]:
+        if not self._power_consumption_stats["power_consumption"]:
             epsilon_rate = self._binary_str_to_int(
-                self.power_consumption_stats["epsilon_rate"],
+                self._power_consumption_stats["epsilon_rate"],
             )
             gamma_rate = self._binary_str_to_int(
-                self.power_consumption_stats["gamma_rate"],
+                self._power_consumption_stats["gamma_rate"],
             )
-            self.power_consumption_stats["power_consumption"] = (
+            self._power_consumption_stats["power_consumption"] = (
                 epsilon_rate * gamma_rate
             )
 
-        return self.power_consumption_stats["power_consumption"]
+        return self._power_consumption_stats["power_consumption"]
 
 
 class LifeSupport(Diagnostics):
@@ -149,6 +209,7 @@ class LifeSupport(Diagnostics):
         data_type: type = str,
         squeeze: bool = True,
         verbose: bool = True,
+        cache: Union[bool, InputCache] = False,
     ) -> None:
         Diagnostics.__init__(
             self,
@@ -157,77 +218,92 @@ class LifeSupport(Diagnostics):
             column_names=column_names,
             data_type=data_type,
             squeeze=squeeze,
+            cache=cache,
         )
 
-        self.most_common = {}
-        self.most_common["binary"] = self._search(input=self.input_df, most_common=True)
-        self.most_common["int"] = self._binary_str_to_int(self.most_common["binary"])
-        self.least_common = {}
-        self.least_common["binary"] = self._search(
-            input=self.input_df, most_common=False
-        )
-        self.least_common["int"] = self._binary_str_to_int(self.least_common["binary"])
-        self.life_support_rating = self.most_common["int"] * self.least_common["int"]
         if verbose:
             print(
                 "Submarine's current life support rating is", self.life_support_rating
             )
 
-    def _bit_stats(self, data: list, bit_pos: int):
-        """Find which rows of the data have which bit (0,1) at the given bit position.
+    @cached_property
+    def _ratings(self) -> Tuple[str, str]:
+        return self._search()
 
-        Args:
-            data (list): The input data
-            bit_pos (int): The bit position to search at
+    @cached_property
+    def most_common(self) -> dict:
+        """The result of the search for the most common bits, in `binary` and as `int`."""
+        return {
+            "binary": self._ratings[0],
+            "int": self._binary_str_to_int(self._ratings[0]),
+        }
 
-        Returns:
-            dict: A dictionary with two lists documenting which row has which bit on the given position.
-        """
-        bits = {"0": [], "1": []}
-        for row, binary in enumerate(data):
-            bits[binary[bit_pos]].append(row)
-        return bits
+    @cached_property
+    def least_common(self) -> dict:
+        """The result of the search for the least common bits, in `binary` and as `int`."""
+        return {
+            "binary": self._ratings[1],
+            "int": self._binary_str_to_int(self._ratings[1]),
+        }
+
+    @cached_property
+    def life_support_rating(self) -> int:
+        """The life support rating of the submarine."""
+        return self.most_common["int"] * self.least_common["int"]
+
+    @staticmethod
+    def _narrow(
+        column: np.ndarray, lo: int, hi: int, most_common: bool
+    ) -> Tuple[int, int]:
+        """Narrow a range of sorted rows down to the rows that keep the wanted bit at the current position.
 
-    def _search(
-        self, input: List[str], bit_pos: int = 0, most_common: bool = True
-    ) -> str:
-        """A recursive search function to perform comparisons of bits on one position at a time
-        in order to determine which binary number fullfills the search requirements.
+        The rows in the range share all previous bits, so the bits at the current position are sorted too and
+        the rows with a 0 bit form a contiguous block before the rows with a 1 bit.
 
         Args:
-            input (list): A list of binary numbers
-            bit_pos (int, optional): The bit position to search at the current recursion level. Defaults to 0.
-            most_common (bool, optional): If True, search for the most popular (or 1) bits, otherwise the least popular (or 0).
-                Defaults to True.
+            column (np.ndarray): The bits of all sorted rows at the current position.
+            lo (int): The first row of the range.
+            hi (int): The end of the range, exclusive.
+            most_common (bool): If True, keep the rows with the least popular bit (0 on ties),
+                otherwise the rows with the most popular bit (1 on ties).
 
         Returns:
-            str: The binary number that is the result of the search.
+            Tuple[int]: The narrowed range.
         """
+        split = lo + int(np.searchsorted(column[lo:hi], 1))
+        zeros, ones = split - lo, hi - split
         if most_common:
-            greater = "1"
-            lesser = "0"
+            keep_zeros = zeros <= ones
         else:
-            greater = "0"
-            lesser = "1"
+            keep_zeros = zeros > ones
+        if zeros == 0 or ones == 0:
+            # every row shares the bit, there is nothing to filter
+            return lo, hi
+        if keep_zeros:
+            return lo, split
+        return split, hi
 
-        if len(input) == 1:
-            return input[0]
+    def _search(self) -> Tuple[str, str]:
+        """Search for the binary numbers that fulfill the requirements, comparing the bits on one position at a time.
 
-        stats = self._bit_stats(input, bit_pos)
+        The report is sorted once so every filtering step keeps a contiguous slice of it, which is found with
+        a binary search. Both searches narrow their own slice in the same pass over the bit positions.
 
-        if len(stats[lesser]) < len(stats[greater]):
-            result = self._search(
-                [input[i] for i in stats["0"]], bit_pos + 1, most_common=most_common
-            )
-        elif len(stats[lesser]) > len(stats[greater]):
-            result = self._search(
-                [input[i] for i in stats["1"]], bit_pos + 1, most_common=most_common
-            )
-        elif len(stats[lesser]) == len(stats[greater]):
-            result = self._search(
-                [input[i] for i in stats[lesser]], bit_pos + 1, most_common=most_common
-            )
-        return result
+        Returns:
+            Tuple[str]: The result of the search keeping the least popular bits (or 0), the CO2 scrubber rating,
+                and of the search keeping the most popular bits (or 1), the oxygen generator rating. See `_narrow`.
+        """
+        rows, bits = self._sorted_report()
+        ranges = {True: (0, rows.shape[0]), False: (0, rows.shape[0])}
+        for bit_pos in range(bits.shape[1]):
+            column = bits[:, bit_pos]
+            for most_common, (lo, hi) in ranges.items():
+                if hi - lo > 1:
+                    ranges[most_common] = self._narrow(column, lo, hi, most_common)
+        return (
+            rows[ranges[True][0]].decode(),
+            rows[ranges[False][0]].decode(),
+        )
 
 
 class Radar(InputSignal, RadarData):
@@ -238,12 +314,26 @@ class Radar(InputSignal, RadarData):
         input,
         header_location: int = None,
         column_names: List[str] = None,
+        chunksize: int = None,
+        cache: Union[bool, InputCache] = False,
     ) -> None:
+        """Point the radar to a sonar sweep.
+
+        Args:
+            input (str): The path to the csv file with the sonar sweep
+            header_location (int, optional): The row on which the csv header appears. Defaults to None.
+            column_names (List[str], optional): The name for the columns in the csv file. Defaults to None.
+            chunksize (int, optional): Stream the sweep in chunks of this many rows, so sweeps larger than memory
+                can be processed. Defaults to None, which loads the whole sweep.
+            cache (Union[bool, InputCache], optional): Reuse the parsed sweep from an `InputCache`. Defaults to False.
+        """
         InputSignal.__init__(
             self,
             input,
             header_location=header_location,
             column_names=column_names,
+            chunksize=chunksize,
+            cache=cache,
         )
         RadarData.__init__(self)
 
@@ -266,6 +356,55 @@ class Radar(InputSignal, RadarData):
     def _rolling_sum(self, window: int) -> dict:
         return self.input_df.rolling(window).sum()
 
+    def _diff_chunks(self, window: int = None) -> dict:
+        """Stream the sweep chunk by chunk and count the step directions, same as `_diff`.
+
+        The last `window - 1` samples are carried over to the next chunk to complete its first windows, and the last
+        valid value per column to compare against its first step.
+
+        Args:
+            window (int, optional): The size of the window in rows. Defaults to None, which compares single samples.
+
+        Returns:
+            dict: The step statistics per column
+        """
+        rows = 0
+        increments = {}
+        decrements = {}
+        last = {}
+        carry = None
+        for chunk in self._input_chunks():
+            rows += chunk.shape[0]
+            if window is None:
+                signal = chunk
+            else:
+                frame = chunk if carry is None else pd.concat([carry, chunk])
+                signal = (
+                    frame.rolling(window).sum().iloc[frame.shape[0] - chunk.shape[0] :]
+                )
+                carry = frame.iloc[max(0, frame.shape[0] - (window - 1)) :]
+            for col in signal.columns:
+                values = signal[col].dropna().to_numpy()
+                if col in last:
+                    values = np.concatenate(([last[col]], values))
+                steps = np.diff(values)
+                increments[col] = increments.get(col, 0) + int((steps > 0).sum())
+                decrements[col] = decrements.get(col, 0) + int((steps < 0).sum())
+                if values.shape[0]:
+                    last[col] = values[-1]
+
+        diff = {}
+        for col in increments:
+            diff.update(
+                self._radar_stats(
+                    col,
+                    increments[col],
+                    decrements[col],
+                    rows - increments[col] - decrements[col],
+                )
+            )
+        return diff
+
     def get_radar_step_directions(self) -> dict:
         """Radar will crunch the numbers and return the pair of steps that were increments, decrements or other.
 
@@ -290,6 +429,8 @@ class Radar(InputSignal, RadarData):
         Returns:
             dict: The step statistics per column
         """
+        if self.input_df is None:
+            return self._diff_chunks()
         return self._diff(self.input_df)
 
     def get_windowed_radar_step_directions(self, window: int) -> dict:
@@ -332,54 +473,562 @@ class Radar(InputSignal, RadarData):
         Returns:
             dict: The step statistics per column
         """
+        if self.input_df is None:
+            return self._diff_chunks(window=window)
         return self._diff(self._rolling_sum(window=window))
 
+    def get_multi_window_radar_step_directions(self, windows: Iterable[int]) -> dict:
+        """Sweep over many window sizes at once, same as running `get_windowed_radar_step_directions` per window.
+
+        Consecutive sums of `window` rows only differ by the row entering and the row leaving the window, so
+        comparing them boils down to comparing `x[i + window]` with `x[i]`. Columns with missing values, which
+        break windows apart, compare differences of a single cumulative sum over the valid windows instead.
+
+        Args:
+            windows (Iterable[int]): The window sizes in rows
+
+        Raises:
+            ValueError: If a window is smaller than one row
+
+        Returns:
+            dict: The step statistics per column, per window size
+        """
+        windows = tuple(windows)
+        if any(window < 1 for window in windows):
+            raise ValueError(
+                f"Can't sweep over windows {windows}, expected at least one row each"
+            )
+        if self.input_df is None:
+            return {window: self._diff_chunks(window=window) for window in windows}
+
+        values = self.input_df.to_numpy(dtype=float)
+        missing = np.isnan(values)
+        has_missing = missing.any(axis=0)
+        if has_missing.any():
+            padding = np.zeros((1, values.shape[1]))
+            sums = np.concatenate(
+                (padding, np.cumsum(np.where(missing, 0, values), axis=0))
+            )
+            gaps = np.concatenate((padding, np.cumsum(missing, axis=0)))
+
+        sweep = {}
+        for window in windows:
+            steps = values[window:] - values[:-window]
+            step_increments = (steps > 0).sum(axis=0)
+            step_decrements = (steps < 0).sum(axis=0)
+            for c in np.nonzero(has_missing)[0]:
+                windowed = sums[window:, c] - sums[:-window, c]
+                complete = gaps[window:, c] == gaps[:-window, c]
+                steps = np.diff(windowed[complete])
+                step_increments[c] = (steps > 0).sum()
+                step_decrements[c] = (steps < 0).sum()
+
+            sweep[window] = {}
+            for c, col in enumerate(self.input_df.columns):
+                sweep[window].update(
+                    self._radar_stats(
+                        col,
+                        int(step_increments[c]),
+                        int(step_decrements[c]),
+                        values.shape[0]
+                        - int(step_increments[c])
+                        - int(step_decrements[c]),
+                    )
+                )
+        return sweep
+
+
+class OnlineRadar(RadarData):
+    """The submarine's live radar, counting the step directions of a sonar feed as the samples come in."""
+
+    def __init__(self, windows: Iterable[int] = (1,), column: str = "signal") -> None:
+        """Start listening.
+
+        Only the last `max(windows)` samples are kept, which is all it takes to compare the windowed sums of the
+        next samples: consecutive sums of `window` samples only differ by the sample entering the window and
+        the one leaving it.
+
+        Args:
+            windows (Iterable[int], optional): The window sizes to count the step directions for, a window of 1
+                compares single samples. Defaults to (1,).
+            column (str, optional): The name of the signal in the statistics. Defaults to "signal".
+
+        Raises:
+            ValueError: If a window is smaller than one sample
+        """
+        RadarData.__init__(self)
+        self.windows = tuple(sorted(set(windows)))
+        if not self.windows or self.windows[0] < 1:
+            raise ValueError(
+                f"Can't count the step directions of windows {windows}, expected at least one sample each"
+            )
+        self.column = column
+        self.samples = 0
+        self.increments = dict.fromkeys(self.windows, 0)
+        self.decrements = dict.fromkeys(self.windows, 0)
+        self._recent = np.empty(0, dtype=np.int64)
+
+    def push(self, samples: Union[int, Iterable[int]]) -> dict:
+        """Count the step directions of the next samples.
+
+        Args:
+            samples (Union[int, Iterable[int]]): The next sample or batch of samples.
+
+        Returns:
+            dict: The step statistics so far per window size, see `get_multi_window_radar_step_directions`.
+        """
+        samples = np.atleast_1d(np.asarray(samples, dtype=np.int64))
+        recent = np.concatenate((self._recent, samples))
+        for window in self.windows:
+            start = max(self._recent.shape[0], window)
+            # not enough samples yet to fill a window and the next one
+            if start >= recent.shape[0]:
+                continue
+            steps = recent[start:] - recent[start - window : recent.shape[0] - window]
+            self.increments[window] += int((steps > 0).sum())
+            self.decrements[window] += int((steps < 0).sum())
+        self._recent = recent[-self.windows[-1] :].copy()
+        self.samples += samples.shape[0]
+        return self.get_multi_window_radar_step_directions()
+
+    async def feed(
+        self, reader: asyncio.StreamReader, batch_size: int = 1 << 16
+    ) -> dict:
+        """Follow a live sonar feed until it ends, one sample per line.
+
+        The feed can be any asyncio stream, such as a socket from `asyncio.open_connection` or the output of a
+        process from `asyncio.create_subprocess_exec`. It is read in batches of up to `batch_size` bytes that
+        are pushed at once. Nothing is read while a batch is processed, so a fast feed fills up the stream's
+        buffer and gets paused instead of piling up samples in memory.
+
+        Args:
+            reader (asyncio.StreamReader): The sonar feed
+            batch_size (int, optional): The maximum number of bytes to read per batch. Defaults to 64 KiB.
+
+        Raises:
+            ValueError: If a sample is not an integer
+
+        Returns:
+            dict: The step statistics of the whole feed per window size, see
+                `get_multi_window_radar_step_directions`.
+        """
+        partial = b""
+        while True:
+            batch = await reader.read(batch_size)
+            if not batch:
+                break
+            batch = partial + batch
+            # the last line may be incomplete, it's finished by the next batch
+            end = batch.rfind(b"\n") + 1
+            partial = batch[end:]
+            if end:
+                self.push(_parse_samples(batch[:end]))
+        if partial.strip():
+            self.push(_parse_samples(partial))
+        return self.get_multi_window_radar_step_directions()
+
+    def get_radar_step_directions(self) -> dict:
+        """The step statistics of single samples so far, see `Radar.get_radar_step_directions`.
+
+        Raises:
+            KeyError: If the radar doesn't count windows of 1
+
+        Returns:
+            dict: The step statistics
+        """
+        return self.get_windowed_radar_step_directions(1)
+
+    def get_windowed_radar_step_directions(self, window: int) -> dict:
+        """The step statistics of the windowed sums so far, see `Radar.get_windowed_radar_step_directions`.
+
+        Args:
+            window (int): The size of the window in samples
+
+        Raises:
+            KeyError: If the radar doesn't count this window size
+
+        Returns:
+            dict: The step statistics
+        """
+        return self._radar_stats(
+            self.column,
+            self.increments[window],
+            self.decrements[window],
+            self.samples - self.increments[window] - self.decrements[window],
+        )
+
+    def get_multi_window_radar_step_directions(self) -> dict:
+        """The step statistics so far of every window size.
+
+        Returns:
+            dict: The step statistics per window size
+        """
+        return {
+            window: self.get_windowed_radar_step_directions(window)
+            for window in self.windows
+        }
+
+
+def _parse_samples(lines: bytes) -> np.ndarray:
+    """Parse whitespace separated sonar samples.
+
+    Raises:
+        ValueError: If a sample is not an integer
+    """
+    return np.array(lines.split(), dtype=bytes).astype(np.int64)
+
+
+def _parse_commands(
+    raw: np.ndarray, directions: Tuple[str, ...]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse navigation commands such as `forward 5` into direction codes and magnitudes.
+
+    Args:
+        raw (np.ndarray): The commands as a fixed-width bytes array.
+        directions (Tuple[str]): The known directions, their position is their code.
+
+    Returns:
+        Tuple[np.ndarray]: The direction code of each command (unknown commands are -1) and its magnitude.
+    """
+    # fixed-width byte matrix, one command per row, padded with zeros
+    chars = raw.view(np.uint8).reshape(raw.shape[0], raw.dtype.itemsize)
+    codes = np.full(raw.shape[0], -1, dtype=np.int8)
+    for code, direction in enumerate(directions):
+        codes[raw.astype(f"S{len(direction) + 1}") == direction.encode() + b" "] = code
+    magnitudes = np.zeros(raw.shape[0], dtype=np.int64)
+    for col in range(chars.shape[1]):
+        digits = chars[:, col] - ord("0")
+        is_digit = digits < 10
+        magnitudes[is_digit] = magnitudes[is_digit] * 10 + digits[is_digit]
+    return codes, magnitudes
+
+
+def _scan_commands(
+    codes: np.ndarray, magnitudes: np.ndarray, activate_aim: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Trace the horizontal, depth and aim values along the commands, starting from the surface.
+
+    Args:
+        codes (np.ndarray): The direction code of each command, 0 is forward, 1 down and 2 up.
+        magnitudes (np.ndarray): The magnitude of each command.
+        activate_aim (bool): Down and up commands change the aim instead of the depth.
+
+    Returns:
+        Tuple[np.ndarray]: The horizontal, depth and aim traces. Aim is empty when aiming is off.
+    """
+    forward = np.where(codes == 0, magnitudes, 0)
+    vertical = np.where(codes == 1, magnitudes, 0) - np.where(codes == 2, magnitudes, 0)
+    horizontal = np.cumsum(forward)
+    if activate_aim:
+        aim = np.cumsum(vertical)
+        depth = np.cumsum(aim * forward)
+    else:
+        aim = np.empty(0, dtype=np.int64)
+        depth = np.cumsum(vertical)
+    return horizontal, depth, aim
+
+
+def _scan_command_chunk(
+    raw: np.ndarray, directions: Tuple[str, ...], activate_aim: bool, trace: bool
+) -> dict:
+    """Parse and trace a chunk of the command log, as if it started at the surface.
+
+    Returns:
+        dict: The net `horizontal`, `depth` and `aim` change over the chunk and, if `trace` is set,
+            the chunk's own traces starting from the surface.
+    """
+    codes, magnitudes = _parse_commands(raw, directions)
+    horizontal, depth, aim = _scan_commands(codes, magnitudes, activate_aim)
+    summary = {
+        "horizontal": int(horizontal[-1]) if horizontal.shape[0] else 0,
+        "depth": int(depth[-1]) if depth.shape[0] else 0,
+        "aim": int(aim[-1]) if aim.shape[0] else 0,
+        "trace": None,
+    }
+    if trace:
+        summary["trace"] = (horizontal, depth, aim)
+    return summary
+
+
+def _scan_command_range(
+    input: str,
+    start: int,
+    end: int,
+    directions: Tuple[str, ...],
+    activate_aim: bool,
+    trace: bool,
+) -> dict:
+    """Read, parse and trace the commands starting in a byte range of the log, as a parallel navigation worker.
+
+    Returns:
+        dict: The net change over the range, see `_stitch_summaries`.
+    """
+    summaries = (
+        _scan_command_chunk(
+            np.array(lines, dtype=bytes), directions, activate_aim, trace
+        )
+        for lines in _iter_line_blocks(input, start, end)
+    )
+    return _stitch_summaries(summaries, activate_aim=activate_aim, trace=trace)
+
+
+def _stitch_summaries(
+    summaries: Iterable[dict], activate_aim: bool, trace: bool
+) -> dict:
+    """Chain the paths of consecutive chunks of the command log, each traced as if it started at the surface.
+
+    This works since the path is an associative scan: a chunk that starts with an offset
+    `(horizontal, depth, aim)` ends at `horizontal + h`, `aim + a` and `depth + d + aim * h` with aiming
+    (`depth + d` without).
+
+    Args:
+        summaries (Iterable[dict]): The summaries of the chunks, in order, see `_scan_command_chunk`
+        activate_aim (bool): Activate the aiming systems.
+        trace (bool): Also stitch the traces of the chunks together.
+
+    Returns:
+        dict: The net `horizontal`, `depth` and `aim` change over all the chunks and, if `trace` is set,
+            their stitched traces.
+    """
+    horizontal = depth = aim = 0
+    traces = {"horizontal": [], "depth": [], "aim": []}
+    for summary in summaries:
+        if trace:
+            h_trace, d_trace, a_trace = summary["trace"]
+            traces["horizontal"].append(horizontal + h_trace)
+            traces["aim"].append(aim + a_trace)
+            traces["depth"].append(
+                depth + d_trace + (aim * h_trace if activate_aim else 0)
+            )
+        if activate_aim:
+            depth += summary["depth"] + aim * summary["horizontal"]
+        else:
+            depth += summary["depth"]
+        horizontal += summary["horizontal"]
+        aim += summary["aim"]
+
+    stitched = {"horizontal": horizontal, "depth": depth, "aim": aim, "trace": None}
+    if trace:
+        stitched["trace"] = tuple(
+            np.concatenate(traces[k]) if traces[k] else np.empty(0, dtype=np.int64)
+            for k in ("horizontal", "depth", "aim")
+        )
+    return stitched
+
+
+def _decimate(
+    x: np.ndarray, y: np.ndarray, points: int, method: str = "lttb"
+) -> np.ndarray:
+    """Pick at most `points` points of a line that keep its shape when plotted.
+
+    The first and last points are always kept, the others are split into buckets of equal size. `"minmax"`
+    keeps the lowest and highest point of every bucket. `"lttb"` (largest triangle three buckets) keeps the
+    point of every bucket that makes the largest triangle with the average points of its neighbouring buckets,
+    using the average of the previous bucket rather than its pick so that all buckets are decimated at once.
+
+    Args:
+        x (np.ndarray): The x values of the line.
+        y (np.ndarray): The y values of the line.
+        points (int): The maximum number of points to keep.
+        method (str, optional): The decimation method, `"lttb"` or `"minmax"`. Defaults to `"lttb"`.
+
+    Raises:
+        ValueError: If the method is unknown
+
+    Returns:
+        np.ndarray: The sorted indices of the points to keep.
+    """
+    if method not in ("lttb", "minmax"):
+        raise ValueError(
+            f"Unknown decimation method {method}, expected 'lttb' or 'minmax'"
+        )
+    n = x.shape[0]
+    if n <= max(points, 2):
+        return np.arange(n)
+    inner = n - 2
+    buckets = (points - 2) // 2 if method == "minmax" else points - 2
+    if buckets < 1:
+        return np.array([0, n - 1])
+    size = -(-inner // buckets)
+    buckets = -(-inner // size)
+    # buckets of the points between the first and last one, the last bucket is padded with its last point
+    starts = np.arange(buckets) * size
+    pad = (0, buckets * size - inner)
+    y_buckets = np.pad(y[1:-1], pad, mode="edge").reshape(buckets, size)
+    if method == "minmax":
+        picks = np.stack((y_buckets.argmin(axis=1), y_buckets.argmax(axis=1)), axis=1)
+    else:
+        x = x.astype(np.float64)
+        y = y.astype(np.float64)
+        x_buckets = np.pad(x[1:-1], pad, mode="edge").reshape(buckets, size)
+        counts = np.diff(np.append(starts, inner))
+        x_means = np.add.reduceat(x[1:-1], starts) / counts
+        y_means = np.add.reduceat(y[1:-1], starts) / counts
+        x_prev = np.concatenate(([x[0]], x_means[:-1]))[:, None]
+        y_prev = np.concatenate(([y[0]], y_means[:-1]))[:, None]
+        x_next = np.concatenate((x_means[1:], [x[-1]]))[:, None]
+        y_next = np.concatenate((y_means[1:], [y[-1]]))[:, None]
+        # twice the triangle areas, the sign doesn't matter
+        areas = np.abs(
+            (x_prev - x_next) * (y_buckets - y_prev)
+            - (x_prev - x_buckets) * (y_next - y_prev)
+        )
+        picks = areas.argmax(axis=1)[:, None]
+    picks = np.minimum(picks + starts[:, None] + 1, n - 2)
+    return np.unique(np.concatenate(([0], picks.reshape(-1), [n - 1])))
+
 
 class Navigation(InputSignal, NavigationData):
     """The submarine's advanced navigation system."""
 
+    directions = ("forward", "down", "up")
+
     def __init__(
         self,
         input,
         header_location: int = None,
         column_names: List[str] = None,
+        chunksize: int = None,
+        cache: Union[bool, InputCache] = False,
     ) -> None:
+        """Load the command log.
+
+        Args:
+            input (str): The path to the csv file with one command per line
+            header_location (int, optional): The row on which the csv header appears. Defaults to None.
+            column_names (List[str], optional): The name for the columns in the csv file. Defaults to None.
+            chunksize (int, optional): Stream the command log in chunks of this many rows instead of loading it,
+                so logs larger than memory can be followed. Defaults to None, which loads the whole log.
+            cache (Union[bool, InputCache], optional): Reuse the parsed log from an `InputCache`. Defaults to False.
+        """
         InputSignal.__init__(
             self,
             input,
             header_location=header_location,
             column_names=column_names,
+            chunksize=chunksize,
+            cache=cache,
         )
         NavigationData.__init__(self)
+        self._commands = None
 
-    def show_plan(self, activate_aim: bool = False) -> None:
+    def show_plan(
+        self,
+        activate_aim: bool = False,
+        max_points: int = None,
+        decimation: str = "lttb",
+    ) -> None:
         """Display the navigation plan on-screen.
 
         Args:
             activate_aim (bool, optional): Toggle to accommodate for the aiming functionality. Defaults to False.
+            max_points (int, optional): Decimate the route down to this many points before plotting it.
+                Defaults to None, which plots every point.
+            decimation (str, optional): How to decimate the route, `"lttb"` or `"minmax"`, see `_decimate`.
+                Defaults to `"lttb"`.
         """
+        import matplotlib.pyplot as plt
+
+        horizontal = np.asarray(self.navigation_trace["horizontal"])
+        depth = np.asarray(self.navigation_trace["depth"])
+        aim = np.asarray(self.navigation_trace["aim"])
+        y = aim if activate_aim else depth
+        if max_points is not None:
+            keep = _decimate(horizontal, y, max_points, method=decimation)
+            horizontal, y = horizontal[keep], y[keep]
+            depth = depth[keep]
         if activate_aim:
-            plt.scatter(
-                self.navigation_trace["horizontal"],
-                [-1 * h for h in self.navigation_trace["aim"]],
-                c=self.navigation_trace["depth"],
-            )
+            plt.scatter(horizontal, -y, c=depth)
             ylabel = "Aim"
             cbar = plt.colorbar()
             cbar.set_label("Depth", rotation=270)
         else:
-            plt.plot(
-                self.navigation_trace["horizontal"],
-                [-1 * h for h in self.navigation_trace["depth"]],
-            )
+            plt.plot(horizontal, -y)
             ylabel = "Depth"
         plt.title("Submarine planned route directions")
         plt.ylabel(ylabel)
         plt.xlabel("Horizontal")
         plt.show()
 
+    def _parse_commands(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse the command signal into direction codes and magnitudes, once per navigation system.
+
+        Returns:
+            Tuple[np.ndarray]: The direction code of each command (see `directions`, unknown commands are -1)
+                and its magnitude.
+        """
+        if self._commands is None:
+            self._commands = _parse_commands(
+                self.input_df["signal"].to_numpy(dtype=bytes), self.directions
+            )
+        return self._commands
+
+    def _calculate_path_parallel(
+        self, activate_aim: bool, trace: bool, processes: int
+    ) -> dict:
+        """Split the command log over a pool of processes and stitch the partial paths together.
+
+        Every worker reads and parses its own byte range of the log, so the log is never loaded as a whole.
+        The chunks are traced as if they started at the surface, see `_stitch_summaries`.
+
+        Args:
+            activate_aim (bool): Activate the aiming systems.
+            trace (bool): Also stitch the full navigation trace together.
+            processes (int): The number of worker processes.
+
+        Returns:
+            dict: The final `horizontal`, `depth` and `aim` values and the stitched `trace`, if any.
+        """
+        with open(self.input, "rb") as f:
+            header_location = self._loader_options["header_location"]
+            for _ in range(0 if header_location is None else header_location + 1):
+                f.readline()
+            start = f.tell()
+            end = f.seek(0, os.SEEK_END)
+        bounds = np.linspace(start, end, processes + 1).astype(np.int64).tolist()
+        with multiprocessing.Pool(processes) as pool:
+            summaries = pool.starmap(
+                _scan_command_range,
+                [
+                    (self.input, lo, hi, self.directions, activate_aim, trace)
+                    for lo, hi in zip(bounds[:-1], bounds[1:])
+                ],
+            )
+        return _stitch_summaries(summaries, activate_aim=activate_aim, trace=trace)
+
+    def _calculate_path_chunked(self, activate_aim: bool, trace: bool) -> dict:
+        """Follow the command log one chunk of `chunksize` rows at a time, see `_calculate_path_parallel`."""
+        summaries = (
+            _scan_command_chunk(
+                chunk["signal"].to_numpy(dtype=bytes),
+                self.directions,
+                activate_aim,
+                trace,
+            )
+            for chunk in self._input_chunks()
+        )
+        return _stitch_summaries(summaries, activate_aim=activate_aim, trace=trace)
+
+    def _keep_trace(
+        self,
+        horizontal: np.ndarray,
+        depth: np.ndarray,
+        aim: np.ndarray,
+        activate_aim: bool,
+    ) -> None:
+        """Keep the whole traces of a path in the telemetry, aim only when aiming."""
+        traces = {"depth": depth, "horizontal": horizontal}
+        if activate_aim:
+            traces["aim"] = aim
+        self.telemetry = TelemetryStore.from_arrays(**traces)
+
     def calculate_path(
-        self, activate_aim: bool = False, plot: bool = True, get: bool = False
+        self,
+        activate_aim: bool = False,
+        plot: bool = True,
+        get: bool = False,
+        processes: int = None,
+        max_points: int = None,
     ) -> dict:
         """Calculate the path from the commands provided.
 
@@ -387,39 +1036,122 @@ class Navigation(InputSignal, NavigationData):
             activate_aim (bool, optional): Activate the aiming systems and navigation will accommodate for precise aim.
                 Defaults to False because we're not hostile by default.
             plot (bool, optional): Display the navigation route on-screen. Defaults to True.
+            processes (int, optional): Split the command log over this many worker processes, each reading its
+                own part of the log. The full trace is only stitched together when it's plotted or returned, as
+                with a streamed log. Defaults to None.
+            max_points (int, optional): Decimate the plotted route down to this many points, see `show_plan`.
+                Defaults to None.
 
         Returns:
-            dict: The expected measures of depth, horizontal and aim values at each step of the journey.
+            dict: The expected measures of depth, horizontal and aim values at each step of the journey, as arrays.
         """
         self._reset_trace()
-        depth = 0
-        horizontal = 0
-        aim = 0
-        for direction in self.input_df.iterrows():
-            command = direction[1]["signal"].split()
-            if command[0] == "forward":
-                horizontal += int(command[1])
-                if activate_aim:
-                    depth += aim * int(command[1])
-            if command[0] == "down":
-                if activate_aim:
-                    aim += int(command[1])
-                else:
-                    depth += int(command[1])
-            if command[0] == "up":
-                if activate_aim:
-                    aim -= int(command[1])
-                else:
-                    depth -= int(command[1])
-            self.navigation_trace["depth"].append(depth)
-            self.navigation_trace["horizontal"].append(horizontal)
-            if activate_aim:
-                self.navigation_trace["aim"].append(aim)
+        if (processes is not None and processes > 1) or self.input_df is None:
+            trace = plot or get
+            if processes is not None and processes > 1:
+                path = self._calculate_path_parallel(
+                    activate_aim=activate_aim, trace=trace, processes=processes
+                )
+            else:
+                path = self._calculate_path_chunked(
+                    activate_aim=activate_aim, trace=trace
+                )
+            if trace:
+                self._keep_trace(*path["trace"], activate_aim=activate_aim)
+            depth, horizontal = path["depth"], path["horizontal"]
+        else:
+            traces = _scan_commands(*self._parse_commands(), activate_aim=activate_aim)
+            self._keep_trace(*traces, activate_aim=activate_aim)
+            depth = horizontal = 0
+            if len(self.telemetry):
+                depth = int(self.telemetry["depth"][-1])
+                horizontal = int(self.telemetry["horizontal"][-1])
+
         if plot:
-            self.show_plan(activate_aim=activate_aim)
+            self.show_plan(activate_aim=activate_aim, max_points=max_points)
         print(
             "The product of `depth` and `horizontal` values at the final destination will be:",
             depth * horizontal,
         )
         if get:
             return self.navigation_trace
+
+
+class OnlineNavigation(NavigationData):
+    """The submarine's live navigation system, fed one command (or batch of commands) at a time."""
+
+    directions = Navigation.directions
+
+    def __init__(self, activate_aim: bool = False, trace_size: int = 10_000) -> None:
+        """Start navigating from the surface.
+
+        Args:
+            activate_aim (bool, optional): Activate the aiming systems. Defaults to False.
+            trace_size (int, optional): How many of the most recent trace points to keep. Defaults to 10_000.
+        """
+        columns = (
+            ("depth", "horizontal", "aim") if activate_aim else ("depth", "horizontal")
+        )
+        NavigationData.__init__(self, trace_size=trace_size, trace_columns=columns)
+        self.activate_aim = activate_aim
+        self.depth = 0
+        self.horizontal = 0
+        self.aim = 0
+
+    def _push_command(self, command: str) -> None:
+        direction, magnitude = command.split()
+        magnitude = int(magnitude)
+        if direction == "forward":
+            self.horizontal += magnitude
+            if self.activate_aim:
+                self.depth += self.aim * magnitude
+        elif direction == "down":
+            if self.activate_aim:
+                self.aim += magnitude
+            else:
+                self.depth += magnitude
+        elif direction == "up":
+            if self.activate_aim:
+                self.aim -= magnitude
+            else:
+                self.depth -= magnitude
+        if self.activate_aim:
+            self._trace(depth=self.depth, horizontal=self.horizontal, aim=self.aim)
+        else:
+            self._trace(depth=self.depth, horizontal=self.horizontal)
+
+    def _push_batch(self, commands: List[str]) -> None:
+        """Trace a batch of commands from the surface and shift it by the current position."""
+        horizontal, depth, aim = _scan_commands(
+            *_parse_commands(np.array(commands, dtype=bytes), self.directions),
+            activate_aim=self.activate_aim,
+        )
+        if self.activate_aim:
+            depth = self.depth + depth + self.aim * horizontal
+            aim = self.aim + aim
+        else:
+            depth = self.depth + depth
+        horizontal = self.horizontal + horizontal
+        if self.activate_aim:
+            self._trace_batch(depth=depth, horizontal=horizontal, aim=aim)
+        else:
+            self._trace_batch(depth=depth, horizontal=horizontal)
+        self.depth = int(depth[-1])
+        self.horizontal = int(horizontal[-1])
+        if self.activate_aim:
+            self.aim = int(aim[-1])
+
+    def push(self, commands: Union[str, List[str]]) -> dict:
+        """Update the position with a single command such as `forward 5` or a batch of commands.
+
+        Args:
+            commands (Union[str, List[str]]): The command or commands to follow.
+
+        Returns:
+            dict: The current `depth`, `horizontal` and `aim` values.
+        """
+        if isinstance(commands, str):
+            self._push_command(commands)
+        elif len(commands) > 0:
+            self._push_batch(commands)
+        return {"depth": self.depth, "horizontal": self.horizontal, "aim": self.aim}
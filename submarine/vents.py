@@ -0,0 +1,249 @@
+from typing import Tuple
+
+import numpy as np
+
+from submarine.inputs import ReadVents
+
+
+class HydrothermalVents(ReadVents):
+    """Map the hydrothermal vents on the ocean floor to find the dangerous spots where vent lines overlap."""
+
+    def __init__(
+        self,
+        input: str,
+        batch_size: int = 1 << 16,
+        engine: str = "auto",
+        memory_budget: int = 1 << 28,
+    ) -> None:
+        """Load the vent lines and check they are horizontal, vertical or diagonal at 45 degrees.
+
+        Args:
+            input (str): The path to the file with one vent line per row
+            batch_size (int, optional): How many vent lines to rasterize at a time, which bounds the memory
+                of the intermediate points. Defaults to 65536.
+            engine (str, optional): How to count the overlaps. `"dense"` counts the points on a grid covering
+                all vent lines, `"sparse"` sorts the points of vertical stripes of the ocean floor and never
+                allocates the grid. `"auto"` picks the dense engine when its grid, along with the counts of a
+                batch added to it, fits in the memory budget.
+                Defaults to "auto".
+            memory_budget (int, optional): The memory in bytes the engines aim to stay within. Defaults to 256 MiB.
+
+        Raises:
+            ValueError: In case a vent line is neither horizontal, vertical nor diagonal at 45 degrees.
+        """
+        if engine not in ("auto", "dense", "sparse"):
+            raise ValueError(
+                f"Unknown engine {engine}, expected 'auto', 'dense' or 'sparse'"
+            )
+        ReadVents.__init__(self, input=input)
+        self.batch_size = batch_size
+        self.engine = engine
+        self.memory_budget = memory_budget
+
+        delta = self.segments[:, 1] - self.segments[:, 0]
+        dx, dy = np.abs(delta[:, 0]), np.abs(delta[:, 1])
+        skewed = np.nonzero((dx != 0) & (dy != 0) & (dx != dy))[0]
+        if skewed.shape[0]:
+            raise ValueError(
+                f"The vent line {self.segments[skewed[0]].tolist()} is not 45 degrees."
+            )
+        self.diagonal = (dx != 0) & (dy != 0)
+
+    def _select(self, diagonals: bool) -> np.ndarray:
+        if diagonals:
+            return self.segments
+        return self.segments[~self.diagonal]
+
+    def _extent(self, segments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The smallest and largest x,y coordinates covered by the vent lines."""
+        points = segments.reshape(-1, 2)
+        return points.min(axis=0), points.max(axis=0)
+
+    def _rasterize(self, segments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate the x,y coordinates of all the points along a batch of vent lines at once.
+
+        Args:
+            segments (np.ndarray): The vent lines shaped `(lines, 2, 2)`
+
+        Returns:
+            Tuple[np.ndarray]: The x and y coordinates of the points
+        """
+        start = segments[:, 0]
+        step = np.sign(segments[:, 1] - start)
+        length = np.abs(segments[:, 1] - start).max(axis=1) + 1
+
+        line = np.repeat(np.arange(segments.shape[0]), length)
+        # the position of each point along its own line
+        t = np.arange(line.shape[0]) - np.repeat(np.cumsum(length) - length, length)
+        x = start[line, 0] + step[line, 0] * t
+        y = start[line, 1] + step[line, 1] * t
+        return x, y
+
+    def display(self, diagonals: bool = True) -> np.ndarray:
+        """Count how many vent lines cover each point of the ocean floor.
+
+        Args:
+            diagonals (bool, optional): Consider the diagonal vent lines as well. Defaults to True.
+
+        Returns:
+            np.ndarray: A grid of counts, indexed by `[x - xmin, y - ymin]` of the covered area.
+        """
+        segments = self._select(diagonals)
+        if segments.shape[0] == 0:
+            return np.zeros((0, 0), dtype=np.int64)
+        low, high = self._extent(segments)
+        width, height = high - low + 1
+
+        counts = np.zeros(width * height, dtype=np.int64)
+        for batch in range(0, segments.shape[0], self.batch_size):
+            x, y = self._rasterize(segments[batch : batch + self.batch_size])
+            counts += np.bincount(
+                (x - low[0]) * height + (y - low[1]), minlength=counts.shape[0]
+            )
+        return counts.reshape(width, height)
+
+    def _cumulative_points(
+        self, segments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count the points of the vent lines that lie left of any x coordinate, from the ends of the lines alone.
+
+        Every line that isn't vertical has exactly one point per x coordinate it spans, so the count grows
+        linearly between the ends of the lines, and vertical lines add all their points at once.
+
+        Args:
+            segments (np.ndarray): The vent lines shaped `(lines, 2, 2)`
+
+        Returns:
+            Tuple[np.ndarray]: The sorted x coordinates where the count changes pace, the number of points left
+                of each of them, and how many points every x coordinate adds from each of them on.
+        """
+        left = segments[:, :, 0].min(axis=1)
+        right = segments[:, :, 0].max(axis=1)
+        vertical = left == right
+        height = np.abs(segments[:, 1, 1] - segments[:, 0, 1]) + 1
+        lines = np.count_nonzero(~vertical)
+        # the count starts at the leftmost line, picks up pace at the left end of every line that isn't
+        # vertical, slows down right after its right end, and jumps right after every vertical line
+        x = np.concatenate(
+            (left[~vertical], right[~vertical] + 1, left[vertical] + 1, [left.min()])
+        )
+        pace = np.repeat([1, -1, 0], [lines, lines, x.shape[0] - 2 * lines])
+        jump = np.concatenate((np.zeros(2 * lines), height[vertical], [0]))
+        x, change = np.unique(x, return_inverse=True)
+        pace = np.cumsum(np.bincount(change, weights=pace)).astype(np.int64)
+        jump = np.bincount(change, weights=jump).astype(np.int64)
+        points = np.cumsum(jump)
+        points[1:] += np.cumsum(pace[:-1] * np.diff(x))
+        return x, points, pace
+
+    def _column_overlaps(self, segments: np.ndarray) -> int:
+        """Count the overlapping points of vent lines clipped to a single column, without generating the points.
+
+        Args:
+            segments (np.ndarray): The vent lines shaped `(lines, 2, 2)`, all in the same column
+
+        Returns:
+            int: The number of dangerous points
+        """
+        bottom = segments[:, :, 1].min(axis=1)
+        top = segments[:, :, 1].max(axis=1)
+        # sweep over the ends of the lines, keeping track of how many lines cover the points in between
+        y, change = np.unique(np.concatenate((bottom, top + 1)), return_inverse=True)
+        cover = np.cumsum(
+            np.bincount(change, weights=np.repeat([1, -1], bottom.shape[0]))
+        )
+        return int(np.diff(y)[cover[:-1] > 1].sum())
+
+    def _sparse_dangerous_vents(self, segments: np.ndarray) -> int:
+        """Count the overlapping points without a grid, one vertical stripe of the ocean floor at a time.
+
+        The stripes are as wide as possible while their points fit in the memory budget, and the points of
+        each stripe are counted by sorting them. Columns that don't fit in the budget on their own are swept
+        over instead, from the ends of the lines.
+
+        Args:
+            segments (np.ndarray): The vent lines shaped `(lines, 2, 2)`
+
+        Returns:
+            int: The number of dangerous points
+        """
+        low, high = self._extent(segments)
+        height = high[1] - low[1] + 1
+        # coordinates, line, position along the line, key and sorting buffer
+        budget = max(1, self.memory_budget // (6 * 8))
+
+        start = segments[:, 0]
+        step = np.sign(segments[:, 1] - start)
+        length = np.abs(segments[:, 1] - start).max(axis=1) + 1
+        vertical = step[:, 0] == 0
+        direction = np.where(vertical, 1, step[:, 0])
+
+        breaks, points, pace = self._cumulative_points(segments)
+        dangerous = 0
+        stripe_start = low[0]
+        while stripe_start <= high[0]:
+            # widest stripe that stays in the budget, but at least one column wide
+            k = np.searchsorted(breaks, stripe_start, side="right") - 1
+            done = points[k] + pace[k] * (stripe_start - breaks[k])
+            k = np.searchsorted(points, done + budget, side="right") - 1
+            stripe_end = high[0] + 1
+            if pace[k]:
+                stripe_end = breaks[k] + (done + budget - points[k]) // pace[k]
+            if k + 1 < breaks.shape[0]:
+                stripe_end = min(stripe_end, breaks[k + 1] - 1)
+            stripe_end = max(stripe_end, stripe_start + 1)
+
+            # clip the lines to the stripe, along their own direction
+            t_first = (stripe_start - start[:, 0]) * direction
+            t_last = (stripe_end - 1 - start[:, 0]) * direction
+            t_first, t_last = np.minimum(t_first, t_last), np.maximum(t_first, t_last)
+            t_first[vertical], t_last[vertical] = 0, length[vertical] - 1
+            t_first, t_last = np.maximum(t_first, 0), np.minimum(t_last, length - 1)
+            inside = t_first <= t_last
+            inside &= ~vertical | (
+                (start[:, 0] >= stripe_start) & (start[:, 0] < stripe_end)
+            )
+            clipped = np.stack(
+                (
+                    start[inside] + step[inside] * t_first[inside, None],
+                    start[inside] + step[inside] * t_last[inside, None],
+                ),
+                axis=1,
+            )
+
+            if stripe_end - stripe_start == 1:
+                dangerous += self._column_overlaps(clipped)
+            elif clipped.shape[0]:
+                x, y = self._rasterize(clipped)
+                _, counts = np.unique(
+                    (x - stripe_start) * height + (y - low[1]), return_counts=True
+                )
+                dangerous += int((counts > 1).sum())
+            stripe_start = stripe_end
+        return dangerous
+
+    def _pick_engine(self, segments: np.ndarray) -> str:
+        if self.engine != "auto":
+            return self.engine
+        low, high = self._extent(segments)
+        width, height = high - low + 1
+        # the grid of counts, and the counts of a batch that are added to it
+        if 2 * int(width) * int(height) * 8 <= self.memory_budget:
+            return "dense"
+        return "sparse"
+
+    def dangerous_vents(self, diagonals: bool = True) -> int:
+        """Count the points where at least two vent lines overlap.
+
+        Args:
+            diagonals (bool, optional): Consider the diagonal vent lines as well. Defaults to True.
+
+        Returns:
+            int: The number of dangerous points
+        """
+        segments = self._select(diagonals)
+        if segments.shape[0] == 0:
+            return 0
+        if self._pick_engine(segments) == "sparse":
+            return self._sparse_dangerous_vents(segments)
+        return int((self.display(diagonals=diagonals) > 1).sum())